@@ -3,6 +3,7 @@ import uvicorn
 import os
 import sys
 import importlib.util
+from types import ModuleType
 from typing import Any, Optional, List
 from rich.console import Console
 from rich.panel import Panel
@@ -45,6 +46,21 @@ def _warn_icon() -> str:
 console = Console()
 
 
+def _find_store(module: ModuleType) -> Optional[FeatureStore]:
+    """Return the FeatureStore defined by a features module.
+
+    A top-level ``STORE`` is used when present; otherwise the module's own
+    namespace is scanned in definition order for the first FeatureStore.
+    """
+    store = getattr(module, "STORE", None)
+    if isinstance(store, FeatureStore):
+        return store
+    for attr in vars(module).values():
+        if isinstance(attr, FeatureStore):
+            return attr
+    return None
+
+
 @app.command(name="events")
 def events_cmd(
     action: str = typer.Argument(..., help="Action: listen"),
@@ -170,12 +186,7 @@ def worker_cmd(
             spec.loader.exec_module(module)
 
         # Find store instance
-        store = None
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, FeatureStore):
-                store = attr
-                break
+        store = _find_store(module)
 
         if not store:
             console.print("[bold red]Error:[/bold red] No FeatureStore found in file.")
@@ -565,12 +576,7 @@ def serve(
         spec.loader.exec_module(module)
 
         # Find FeatureStore instance in the module
-        store = None
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, FeatureStore):
-                store = attr
-                break
+        store = _find_store(module)
 
         if not store:
             console.print(
@@ -784,12 +790,7 @@ def ui(
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
 
-        store = None
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, FeatureStore):
-                store = attr
-                break
+        store = _find_store(module)
 
         if not store:
             console.print(
@@ -2281,6 +2282,9 @@ def index_cmd(
     action: str = typer.Argument(..., help="Action: create, status"),
     name: str = typer.Argument(..., help="Name of the index"),
     dimension: int = typer.Option(1536, help="Vector dimension (create only)"),
+    precision: str = typer.Option(
+        "fp32", help="Embedding precision: fp32 or fp16 (create only)"
+    ),
     postgres_url: str = typer.Option(
         None, envvar="FABRA_POSTGRES_URL", help="Postgres URL Override"
     ),
@@ -2292,6 +2296,7 @@ def index_cmd(
     Manage vector indexes.
     Usage:
       fabra index create my_index --dimension=1536
+      fabra index create my_index --precision=fp16  # halfvec storage
       fabra index status my_index
       fabra index create my_index --dry-run  # Preview only
     """
@@ -2316,6 +2321,7 @@ def index_cmd(
                             f"[bold]Dry Run:[/bold] Would create index table\n\n"
                             f"  Table:     [cyan]{table_name}[/cyan]\n"
                             f"  Dimension: [cyan]{dimension}[/cyan]\n"
+                            f"  Precision: [cyan]{precision}[/cyan]\n"
                             f"  Database:  [dim]{url.split('@')[-1] if '@' in url else url}[/dim]\n\n"
                             f"Run without --dry-run to execute.",
                             title="Index Preview",
@@ -2325,9 +2331,10 @@ def index_cmd(
                     return
 
                 console.print(
-                    f"Creating index [bold]{name}[/bold] (dim={dimension})..."
+                    f"Creating index [bold]{name}[/bold] "
+                    f"(dim={dimension}, precision={precision})..."
                 )
-                await store.create_index_table(name, dimension)
+                await store.create_index_table(name, dimension, precision)
                 console.print(f"[green]Index '{name}' created successfully.[/green]")
 
             elif action == "status":
@@ -2753,12 +2760,7 @@ def demo_cmd(
         sys.modules[module_name] = module
         spec.loader.exec_module(module)
 
-        store = None
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if isinstance(attr, FeatureStore):
-                store = attr
-                break
+        store = _find_store(module)
 
         if not store:
             console.print(
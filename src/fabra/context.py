@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 import uuid6
 import hashlib
 import json
+import orjson
 from datetime import datetime, timezone, timedelta
 from contextvars import ContextVar
 from fabra.utils.tokens import TokenCounter, OpenAITokenCounter
@@ -816,8 +817,7 @@ def context(
                 try:
                     cached_bytes = await backend.get(cache_key)
                     if cached_bytes:
-                        data = json.loads(cached_bytes)
-                        cached_ctx = Context(**data)
+                        cached_ctx = Context.model_validate(orjson.loads(cached_bytes))
 
                         # CHECK FRESHNESS SLA
                         is_fresh = True
@@ -906,11 +906,18 @@ def context(
                             # For ties, drop later items first.
                             candidates.sort(key=lambda x: (-x[1].priority, -x[0]))
 
+                            # Count every candidate in one batch call rather
+                            # than one encoder call per dropped item.
+                            candidate_tokens = counter.count_batch(
+                                [item.content for _, item in candidates]
+                            )
+
                             indices_to_drop = set()
-                            for idx, item in candidates:
+                            for (idx, item), item_tokens in zip(
+                                candidates, candidate_tokens
+                            ):
                                 if total_tokens <= max_tokens:
                                     break
-                                item_tokens = counter.count(item.content)
                                 total_tokens -= item_tokens
                                 indices_to_drop.add(idx)
                                 # Track dropped item with full metadata
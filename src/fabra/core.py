@@ -547,7 +547,7 @@ class FeatureStore:
                         entity_name, entity_id, {feature_name: val}
                     )
                 except Exception as e:
-                    log.debug(
+                    log.warning(
                         "online_store_writeback_failed",
                         feature=feature_name,
                         error=str(e),
@@ -725,7 +725,7 @@ class FeatureStore:
             try:
                 offline_store_any = cast(Any, self.offline_store)
                 await offline_store_any.create_index_table(
-                    index_name, dimension=dimension
+                    index_name, dimension=dimension, precision=idx.precision
                 )
             except Exception as e:
                 raise RuntimeError(
@@ -5,6 +5,9 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Text inside curly braces, non-nested: {var_name} or {entity.var_name}
+_TEMPLATE_VAR_RE = re.compile(r"\{([\w\.]+)\}")
+
 
 class DependencyResolver:
     """
@@ -21,9 +24,7 @@ class DependencyResolver:
         Extracts variable names from a format string.
         Matches {var_name} or {entity.var_name}.
         """
-        # Regex to find text inside curly braces, non-nested
-        matches = re.findall(r"\{([\w\.]+)\}", template)
-        return set(matches)
+        return set(_TEMPLATE_VAR_RE.findall(template))
 
     async def resolve(self, template: str, context_data: Dict[str, Any]) -> str:
         """
@@ -14,6 +14,7 @@ class Index:
     overlap: float = 0.1
     description: Optional[str] = None
     embedding_model: str = "text-embedding-3-small"  # Default
+    precision: str = "fp32"  # "fp16" stores embeddings as pgvector halfvec
 
     def chunk_text(self, text: str) -> List[str]:
         """Chunks text using tiktoken."""
@@ -58,6 +59,7 @@ def index(
     chunk_size: int = 512,
     overlap: float = 0.1,
     embedding_model: str = "text-embedding-3-small",
+    precision: str = "fp32",
 ) -> Callable[[Any], Any]:
     """
     Decorator to define a managed Index.
@@ -75,6 +77,7 @@ def index(
             overlap=overlap,
             description=func.__doc__,
             embedding_model=embedding_model,
+            precision=precision,
         )
 
         # We need to register it.
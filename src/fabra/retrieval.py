@@ -1,6 +1,7 @@
 from typing import Any, Callable, List, Optional, Dict, Union, cast
 from dataclasses import dataclass, field
 import functools
+import orjson
 import structlog
 from datetime import timedelta
 import time
@@ -171,7 +172,7 @@ def retriever(
                         cached = await store_backend.get(cache_key)
                         if cached:
                             logger.info(f"Retriever Cache Hit: {r_name}")
-                            parsed = cast(List[Dict[str, Any]], json.loads(cached))
+                            parsed = cast(List[Dict[str, Any]], orjson.loads(cached))
                             try:
                                 from fabra.context import record_retriever_usage
 
@@ -336,7 +337,7 @@ def retriever(
                     try:
                         ttl_sec = int(ret_obj.cache_ttl.total_seconds())  # type: ignore
                         await store_backend.set(
-                            cache_key, json.dumps(result), ex=ttl_sec
+                            cache_key, orjson.dumps(result), ex=ttl_sec
                         )
                     except Exception as e:
                         logger.warning(f"Retriever Cache Write Error: {e}")
@@ -1,7 +1,6 @@
 from fastapi import (
     FastAPI,
     HTTPException,
-    Request,
     Response,
     Depends,
     Security,
@@ -11,7 +10,9 @@ from fastapi.responses import HTMLResponse
 from contextlib import asynccontextmanager
 from fastapi.security.api_key import APIKeyHeader
 from pydantic import BaseModel
-from typing import List, Dict, Any, cast, AsyncGenerator, Optional
+from typing import List, Dict, Any, AsyncGenerator, Iterable, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import asyncio
 import time
 import os
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
@@ -58,6 +59,76 @@ class BatchFeatureRequest(BaseModel):
     features: List[str]
 
 
+_AUDITED_METHODS = frozenset({"POST", "PUT", "DELETE", "PATCH"})
+
+# Scrape and liveness probes hit these constantly; timing them only adds noise
+_SKIP_PATHS = frozenset({"/metrics", "/health"})
+
+
+class MetricsASGIMiddleware:
+    """
+    Records request metrics and audit logs as a plain ASGI middleware.
+
+    Unlike ``@app.middleware("http")`` this does not route responses through
+    BaseHTTPMiddleware's in-memory stream, and exceptions propagate unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: Iterable[str] = _SKIP_PATHS) -> None:
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Default to 500 so a handler that raises before responding is labelled
+        status_holder = [500]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        start_time = time.time()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            status_holder[0] = 500
+            raise
+        finally:
+            self._record(scope, status_holder[0], time.time() - start_time)
+
+    @staticmethod
+    def _record(scope: Scope, status: int, process_time: float) -> None:
+        method = scope["method"]
+        path = scope["path"]
+
+        REQUEST_LATENCY.labels(method=method, endpoint=path).observe(process_time)
+        REQUEST_COUNT.labels(method=method, endpoint=path, status=status).inc()
+
+        # Audit Log for Modifications
+        if method in _AUDITED_METHODS:
+            # Extract user_id from API key (simplified)
+            # In real world, we'd decode JWT or look up key owner.
+            # Here we just use the hash prefix or 'dev' if public.
+            api_key = "public"
+            for name, value in scope.get("headers", ()):
+                if name == b"x-api-key":
+                    api_key = value.decode("latin-1")
+                    break
+            user_id = "dev_user" if api_key == "public" else f"key_{hash(api_key)}"
+
+            logger.info(
+                "audit_log",
+                audit=True,
+                user_id=user_id,
+                method=method,
+                path=path,
+                status=status,
+            )
+
+
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
@@ -83,6 +154,12 @@ def create_app(store: FeatureStore) -> FastAPI:
     async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         # Startup
         logger.info("server_startup")
+        if hasattr(store.offline_store, "warmup"):
+            try:
+                await store.offline_store.warmup()
+            except Exception as e:
+                # Serving can start without a warm pool; connections open lazily.
+                logger.warning("offline_store_warmup_failed", error=str(e))
         yield
         # Shutdown
         logger.info("server_shutdown")
@@ -100,40 +177,7 @@ def create_app(store: FeatureStore) -> FastAPI:
         # This adds spans for every request
         FastAPIInstrumentor.instrument_app(app)
 
-    @app.middleware("http")
-    async def metrics_middleware(request: Request, call_next: Any) -> Response:
-        start_time = time.time()
-        response = cast(Response, await call_next(request))
-        process_time = time.time() - start_time
-
-        REQUEST_LATENCY.labels(
-            method=request.method, endpoint=request.url.path
-        ).observe(process_time)
-
-        REQUEST_COUNT.labels(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code,
-        ).inc()
-
-        # Audit Log for Modifications
-        if request.method in ["POST", "PUT", "DELETE", "PATCH"]:
-            # Extract user_id from API key (simplified)
-            # In real world, we'd decode JWT or look up key owner.
-            # Here we just use the hash prefix or 'dev' if public.
-            api_key = request.headers.get("X-API-Key", "public")
-            user_id = "dev_user" if api_key == "public" else f"key_{hash(api_key)}"
-
-            logger.info(
-                "audit_log",
-                audit=True,
-                user_id=user_id,
-                method=request.method,
-                path=request.url.path,
-                status=response.status_code,
-            )
-
-        return response
+    app.add_middleware(MetricsASGIMiddleware)
 
     @app.get("/metrics")
     async def metrics() -> Response:
@@ -142,27 +186,46 @@ def create_app(store: FeatureStore) -> FastAPI:
     # V1 Router
     v1_router = APIRouter(prefix="/v1")
 
+    batch_concurrency = int(os.getenv("FABRA_BATCH_CONCURRENCY", "32"))
+
     @v1_router.post("/features/batch")
     async def get_batch_features(
         request: BatchFeatureRequest, api_key: str = Depends(get_api_key)
     ) -> Dict[str, Any]:
         """
         Batch retrieve features for multiple entities.
+
+        Lookups are issued concurrently; a failure for one entity is reported
+        in its slot without failing the whole batch.
         """
-        results = {}
-        for entity_id in request.ids:
-            try:
-                # Reuse existing logic (sequentially for MVP, parallelize later)
-                # In a real impl, we'd add store.get_online_features_batch
-                feats = await store.get_online_features(
+        # Bound in-flight lookups so a large batch cannot open one connection
+        # (or run one cold-start computation) per id all at once.
+        semaphore = asyncio.Semaphore(batch_concurrency)
+
+        async def fetch(entity_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await store.get_online_features(
                     entity_name=request.name,
                     entity_id=entity_id,
                     features=request.features,
                 )
+
+        feats_list = await asyncio.gather(
+            *(fetch(entity_id) for entity_id in request.ids),
+            return_exceptions=True,
+        )
+        results: Dict[str, Any] = {}
+        for entity_id, feats in zip(request.ids, feats_list):
+            if isinstance(feats, Exception):
+                logger.error(
+                    "batch_feature_error", entity_id=entity_id, error=str(feats)
+                )
+                results[entity_id] = {"error": str(feats)}
+            elif isinstance(feats, BaseException):
+                # Cancellation and interpreter exits are not per-entity errors
+                raise feats
+            else:
                 results[entity_id] = feats
-            except Exception as e:
-                logger.error("batch_feature_error", entity_id=entity_id, error=str(e))
-                results[entity_id] = {"error": str(e)}
         return results
 
     @v1_router.post("/features")
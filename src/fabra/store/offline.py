@@ -8,9 +8,11 @@ import asyncio
 from typing import Dict, Any
 from datetime import datetime, timezone
 import os
+import re
 from pathlib import Path
 
 
+import pyarrow as pa
 import structlog
 
 if TYPE_CHECKING:
@@ -20,6 +22,25 @@ logger = structlog.get_logger()
 
 T = TypeVar("T")
 
+# SQL identifiers (feature tables/columns) that are interpolated into queries
+_IDENT_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _entity_relation(entity_df: Any) -> Any:
+    """
+    Returns the object to register as ``entity_df`` in DuckDB.
+
+    Arrow tables use DuckDB's zero-copy Arrow scan instead of the per-column
+    pandas dtype walk. Arrow input is passed through untouched; pandas input
+    is converted once, and used as-is if Arrow cannot represent the frame.
+    """
+    if isinstance(entity_df, pa.Table):
+        return entity_df
+    try:
+        return pa.Table.from_pandas(entity_df, preserve_index=False)
+    except pa.ArrowException:
+        return entity_df
+
 
 class OfflineStore(ABC):
     @abstractmethod
@@ -279,16 +300,13 @@ class DuckDBOfflineStore(OfflineStore):
         query = "SELECT entity_df.*"
         joins = ""
 
-        import re
-
-        ident_re = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
-        if not ident_re.match(entity_id_col):
+        if not _IDENT_RE.match(entity_id_col):
             raise ValueError(f"Invalid entity_id_col: {entity_id_col!r}")
-        if not ident_re.match(timestamp_col):
+        if not _IDENT_RE.match(timestamp_col):
             raise ValueError(f"Invalid timestamp_col: {timestamp_col!r}")
 
         for feature in features:
-            if not ident_re.match(feature):
+            if not _IDENT_RE.match(feature):
                 raise ValueError(f"Invalid feature name: {feature}")
 
             join_sql = f'LEFT JOIN LATERAL ( SELECT f."{feature}" AS "{feature}" FROM "{feature}" f WHERE f."entity_id" = entity_df."{entity_id_col}" AND f."timestamp" <= entity_df."{timestamp_col}" ORDER BY f."timestamp" DESC LIMIT 1 ) AS "{feature}_lat" ON TRUE'  # nosec B608
@@ -302,7 +320,7 @@ class DuckDBOfflineStore(OfflineStore):
 
             def _run() -> pd.DataFrame:
                 conn = self._get_conn()
-                conn.register("entity_df", entity_df)
+                conn.register("entity_df", _entity_relation(entity_df))
                 return conn.execute(query).df()
 
             return await self._run_db(_run)
@@ -348,12 +366,9 @@ class DuckDBOfflineStore(OfflineStore):
         query = f"SELECT {selects} FROM request_ctx"  # nosec
 
         joins = ""
-        import re
-
-        ident_re = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
 
         for feature in features:
-            if not ident_re.match(feature):
+            if not _IDENT_RE.match(feature):
                 logger.warning("invalid_feature_name", feature=feature)
                 continue
 
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
+import orjson
 
 
 def _wrap_feature_value(value: Any, as_of: Optional[datetime] = None) -> Dict[str, Any]:
@@ -27,6 +28,20 @@ class OnlineStore(ABC):
         """
         pass
 
+    async def get_online_features_batch(
+        self, entity_name: str, entity_ids: List[str], feature_names: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieves feature values for several entities, in the order of entity_ids.
+
+        The default issues one lookup per entity; network-backed stores override
+        this to fetch the whole batch in a single round-trip.
+        """
+        return [
+            await self.get_online_features(entity_name, entity_id, feature_names)
+            for entity_id in entity_ids
+        ]
+
     @abstractmethod
     async def set_online_features(
         self,
@@ -46,6 +61,21 @@ class OnlineStore(ABC):
         """
         pass
 
+    async def set_online_features_batch(
+        self,
+        entity_name: str,
+        rows: Dict[str, Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Writes feature values for several entities, keyed by entity id.
+
+        The default issues one write per entity; stores that can apply the
+        whole batch at once override this.
+        """
+        for entity_id, features in rows.items():
+            await self.set_online_features(entity_name, entity_id, features, ttl=ttl)
+
     @abstractmethod
     async def set_online_features_bulk(
         self,
@@ -84,6 +114,15 @@ class OnlineStore(ABC):
     def pipeline(self) -> Any:
         pass
 
+    async def cache_set_obj(self, key: str, obj: Any, ex: Optional[int] = None) -> Any:
+        """Serializes ``obj`` with orjson and stores it under ``key``."""
+        return await self.set(key, orjson.dumps(obj), ex=ex)
+
+    async def cache_get_obj(self, key: str) -> Any:
+        """Returns the object stored by ``cache_set_obj``, or None on a miss."""
+        raw = await self.get(key)
+        return orjson.loads(raw) if raw else None
+
     # --- Optional Metadata Path ---
     # Used to compute freshness and build lineage without changing the public return values.
     async def get_online_features_with_meta(
@@ -102,13 +141,17 @@ class InMemoryOnlineStore(OnlineStore):
     async def get_online_features(
         self, entity_name: str, entity_id: str, feature_names: List[str]
     ) -> Dict[str, Any]:
-        entity_storage = self._storage.get(entity_name, {})
-        features = entity_storage.get(entity_id, {})
+        entity_storage = self._storage.get(entity_name)
+        if entity_storage is None:
+            return {}
+        features = entity_storage.get(entity_id)
+        if not features:
+            return {}
         result: Dict[str, Any] = {}
         for name in feature_names:
             if name not in features:
                 continue
-            raw = features.get(name)
+            raw = features[name]
             if isinstance(raw, dict) and raw.get("__fabra_feature_value__") is True:
                 result[name] = raw.get("value")
             else:
@@ -118,13 +161,17 @@ class InMemoryOnlineStore(OnlineStore):
     async def get_online_features_with_meta(
         self, entity_name: str, entity_id: str, feature_names: List[str]
     ) -> Dict[str, Dict[str, Any]]:
-        entity_storage = self._storage.get(entity_name, {})
-        features = entity_storage.get(entity_id, {})
+        entity_storage = self._storage.get(entity_name)
+        if entity_storage is None:
+            return {}
+        features = entity_storage.get(entity_id)
+        if not features:
+            return {}
         result: Dict[str, Dict[str, Any]] = {}
         for name in feature_names:
             if name not in features:
                 continue
-            raw = features.get(name)
+            raw = features[name]
             if isinstance(raw, dict) and raw.get("__fabra_feature_value__") is True:
                 result[name] = raw
             else:
@@ -139,13 +186,24 @@ class InMemoryOnlineStore(OnlineStore):
         ttl: Optional[int] = None,
     ) -> None:
         """Writes features to memory. TTL is currently ignored in-memory."""
-        if entity_name not in self._storage:
-            self._storage[entity_name] = {}
-        if entity_id not in self._storage[entity_name]:
-            self._storage[entity_name][entity_id] = {}
-
         wrapped = {k: _wrap_feature_value(v) for k, v in features.items()}
-        self._storage[entity_name][entity_id].update(wrapped)
+        self._storage.setdefault(entity_name, {}).setdefault(entity_id, {}).update(
+            wrapped
+        )
+
+    async def set_online_features_batch(
+        self,
+        entity_name: str,
+        rows: Dict[str, Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Writes all rows in one pass, stamped with a single as_of time."""
+        as_of = datetime.now(timezone.utc)
+        entity_storage = self._storage.setdefault(entity_name, {})
+        for entity_id, features in rows.items():
+            entity_storage.setdefault(entity_id, {}).update(
+                {k: _wrap_feature_value(v, as_of) for k, v in features.items()}
+            )
 
     async def set_online_features_bulk(
         self,
@@ -155,13 +213,16 @@ class InMemoryOnlineStore(OnlineStore):
         entity_id_col: str,
         ttl: Optional[int] = None,
     ) -> None:
-        # Iterate over dataframe and set features
-        for _, row in features_df.iterrows():
-            entity_id = str(row[entity_id_col])
-            value = row[feature_name]
-            await self.set_online_features(
-                entity_name, entity_id, {feature_name: value}
-            )
+        # Extract whole columns instead of materializing a Series per row
+        entity_ids = features_df[entity_id_col].astype(str).tolist()
+        values = features_df[feature_name].tolist()
+        await self.set_online_features_batch(
+            entity_name,
+            {
+                entity_id: {feature_name: value}
+                for entity_id, value in zip(entity_ids, values)
+            },
+        )
 
     # --- Cache Primitives for Context API ---
     async def get(self, key: str) -> Optional[bytes]:
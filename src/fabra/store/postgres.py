@@ -1,10 +1,14 @@
+import asyncio
 from datetime import datetime, timezone
 import re
 import os
 from typing import List, Optional, Dict, Any, TYPE_CHECKING
 import json
 import hashlib
+import orjson
 import pandas as pd
+import pyarrow as pa
+from pgvector.asyncpg import register_vector
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
 from fabra.store.offline import OfflineStore
@@ -16,6 +20,37 @@ if TYPE_CHECKING:
 
 logger = structlog.get_logger()
 
+# Feature and index names are interpolated into SQL, so they must be identifiers
+_FEATURE_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+# Session-local staging table for add_documents. Rows are COPYed in and then
+# moved to the index table in one INSERT ... SELECT; ON COMMIT DELETE ROWS
+# empties it at the end of each transaction without a TRUNCATE round-trip.
+# Embeddings are staged as float4[] so COPY sends them as binary floats;
+# pgvector's assignment cast turns real[] into the index table's vector or
+# halfvec column on the way in.
+_INDEX_STAGE_TABLE = "fabra_index_stage"
+_INDEX_STAGE_DDL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {_INDEX_STAGE_TABLE} ("
+    " entity_id TEXT, chunk_index INTEGER, content TEXT,"
+    " content_hash TEXT, embedding FLOAT4[], metadata BYTEA"
+    ") ON COMMIT DELETE ROWS"
+)
+# pgvector column type per index precision
+_VECTOR_TYPES = {"fp32": "vector", "fp16": "halfvec"}
+
+# Marks pooled connections that already have pgvector's binary codec registered
+_VECTOR_CODEC = "fabra_vector_codec"
+
+_INDEX_STAGE_COLUMNS = [
+    "entity_id",
+    "chunk_index",
+    "content",
+    "content_hash",
+    "embedding",
+    "metadata",
+]
+
 
 class PostgresOfflineStore(OfflineStore):
     def __init__(self, connection_string: str) -> None:
@@ -34,11 +69,25 @@ class PostgresOfflineStore(OfflineStore):
         pool_size = int(os.getenv("FABRA_PG_POOL_SIZE", "5"))
         max_overflow = int(os.getenv("FABRA_PG_MAX_OVERFLOW", "10"))
 
+        # JIT compilation costs tens of milliseconds and never pays off for the
+        # short point lookups and vector searches this store issues.
+        self._pool_size = pool_size
         self.engine: AsyncEngine = create_async_engine(
             connection_string,
             pool_size=pool_size,
             max_overflow=max_overflow,
+            connect_args={"server_settings": {"jit": "off"}},
+        )
+
+    async def warmup(self) -> None:
+        """
+        Opens pool_size connections up front so the first requests don't pay
+        for TCP/TLS setup and the Postgres startup handshake.
+        """
+        conns = await asyncio.gather(
+            *(self.engine.connect().start() for _ in range(self._pool_size))
         )
+        await asyncio.gather(*(conn.close() for conn in conns))
 
     async def get_training_data(
         self,
@@ -48,7 +97,7 @@ class PostgresOfflineStore(OfflineStore):
         timestamp_col: str = "timestamp",
     ) -> pd.DataFrame:
         # MVP: Similar to DuckDB, we assume features are accessible via SQL.
-        # We upload the entity_df to a temporary table and join.
+        # We look each feature up for the entity keys and join the results.
 
         # Normalize timestamps.
         #
@@ -60,127 +109,92 @@ class PostgresOfflineStore(OfflineStore):
         # - tz-naive datetime64[ns] (localizes to UTC)
         # - tz-aware timestamps (converts to UTC)
         # - object dtype with python datetimes/strings (parses)
+        #
+        # The result is cast to numpy datetime64[ns] so Arrow-backed input
+        # (timestamp[ns][pyarrow]) joins against the SQL side's numpy keys.
         entity_df_norm = entity_df.copy()
         if timestamp_col in entity_df_norm.columns:
             ts_utc = pd.to_datetime(entity_df_norm[timestamp_col], utc=True)
-            entity_df_norm[timestamp_col] = ts_utc.dt.tz_convert("UTC").dt.tz_localize(
-                None
-            )
-
-        async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
-            # 1. Upload entity_df to temp table
-            # Pandas to_sql is sync, so we can't use it directly with async engine easily
-            # without running in executor or using a sync connection.
-            # For MVP, we'll create the table manually and insert values.
-            # This is slow but works for proof of concept.
-
-            # Create temp table
-            await conn.execute(
-                text(
-                    "CREATE TEMP TABLE IF NOT EXISTS temp_entity_lookup (entity_id VARCHAR, timestamp TIMESTAMP)"
-                )
+            entity_df_norm[timestamp_col] = (
+                ts_utc.dt.tz_convert("UTC")
+                .dt.tz_localize(None)
+                .astype("datetime64[ns]")
             )
-            await conn.execute(text("DELETE FROM temp_entity_lookup"))
-
-            # Insert values
-            # Insert values
-            # Note: We use SQLAlchemy's parameter binding for batch insert (executemany).
-            # This is efficient for moderate sizes but slower than Postgres COPY for massive datasets.
-            # Production upgrade: Use asyncpg.copy_records_to_table().
-            values = []
-            for _, row in entity_df_norm.iterrows():
-                # Timestamp is now guaranteed Aware UTC by our normalization above
-                ts_val = row[timestamp_col].to_pydatetime()
-                values.append(
-                    {
-                        "entity_id": str(row[entity_id_col]),
-                        "timestamp": ts_val,
-                    }
-                )
 
-            if values:
-                await conn.execute(
-                    text(
-                        "INSERT INTO temp_entity_lookup (entity_id, timestamp) VALUES (:entity_id, :timestamp)"
-                    ),
-                    values,
-                )
-
-            await conn.commit()
-
-            # 2. Execute join using LATERAL JOIN for Point-in-Time Correctness
-            query_parts = ["SELECT e.*"]
-            joins = ""
-
-            import re
-
-            for feature in features:
-                if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", feature):
-                    raise ValueError(f"Invalid feature name: {feature}")
-
-                joins += (
-                    f" LEFT JOIN LATERAL ("
-                    f" SELECT {feature}"
-                    f" FROM {feature} f"  # nosec
-                    f" WHERE f.entity_id = e.entity_id"
-                    f" AND f.timestamp <= e.timestamp"
-                    f" ORDER BY f.timestamp DESC"
-                    f" LIMIT 1"
-                    f" ) {feature}_lat ON TRUE"
-                )
-                query_parts.append(f", {feature}_lat.{feature} AS {feature}")
+        for feature in features:
+            if not _FEATURE_NAME_RE.match(feature):
+                raise ValueError(f"Invalid feature name: {feature}")
 
-            query = "".join(query_parts) + f" FROM temp_entity_lookup e {joins}"
+        if not features:
+            return entity_df_norm
 
-            result = await conn.execute(text(query))  # nosec
-            rows = result.fetchall()
+        # 1. Entity keys.
+        #
+        # The keys are bound to every feature query as two binary-encoded
+        # arrays (text[] and timestamp[]) and unnested server-side, so no
+        # session temp table is needed and each feature can run on its own
+        # pooled connection. Columns are extracted whole rather than
+        # row-by-row; timestamps are naive UTC after normalization, so
+        # datetime64[us] -> datetime is exact.
+        #
+        # Ids are cast once to Arrow-backed strings, the same dtype the SQL
+        # side uses, so the final join hashes Arrow buffers rather than
+        # Python str objects. Missing ids are bound as NULL and match nothing.
+        entity_df_norm[entity_id_col] = entity_df_norm[entity_id_col].astype(
+            "string[pyarrow]"
+        )
+        entity_ids = pa.array(entity_df_norm[entity_id_col]).to_pylist()
+        timestamps = (
+            entity_df_norm[timestamp_col].to_numpy(dtype="datetime64[us]").tolist()
+        )
 
-            # Convert to DataFrame
-            # Convert to DataFrame
-            if rows:
-                sql_df = pd.DataFrame(rows, columns=result.keys())
-            else:
-                sql_df = pd.DataFrame(columns=list(result.keys()))
-
-            # Ensure sql_df has UTC timezone to match entity_df_norm
-            # asyncpg returns aware datetimes, likely UTC.
-            # We assume sql_df is already aware.
-
-            # Merge back to original entity_df (using the normalized one for keys)
-            # We merge on entity_id and timestamp.
-            # Note: The temp table used 'entity_id' and 'timestamp' as column names.
-            # We need to map them back if the original cols were different, but for now we assume standard names
-            # or that the caller handles column mapping.
-            # Actually, the simplest way is to merge on the index if we preserved order, but SQL doesn't guarantee order.
-            # So we merge on the join keys.
-
-            # Ensure join keys match types
-            sql_df["entity_id"] = sql_df["entity_id"].astype(str)
-            # timestamp might be datetime64[ns] in pandas and datetime in postgres
-
-            # To be safe and simple:
-            # 1. Rename sql_df columns to match entity_id_col and timestamp_col if they differ
-            if "entity_id" in sql_df.columns and entity_id_col != "entity_id":
-                sql_df = sql_df.rename(columns={"entity_id": entity_id_col})
-            if "timestamp" in sql_df.columns and timestamp_col != "timestamp":
-                sql_df = sql_df.rename(columns={"timestamp": timestamp_col})
-
-            # 2. Merge
-            # We use a left join to keep all rows from entity_df_norm
-            # We use entity_df_norm for the merge to ensure TZs match (both Aware UTC)
-            merged_df_norm = pd.merge(
-                entity_df_norm,
-                sql_df,
-                on=[entity_id_col, timestamp_col],
-                how="left",
-                suffixes=("", "_sql"),
-            )
-
-            # 3. Restore original non-normalized entity_df structure?
-            # The caller might expect strict preservation of the input dataframe.
-            # But the features are attached. If we return the normalized timestamps (UTC), it's generally cleaner.
-            # Let's return the merged result with normalized UTC timestamps.
-            return merged_df_norm
+        # 2. Point-in-time lookup, one query per feature.
+        #
+        # Each feature table is scanned once: DISTINCT ON keeps the latest
+        # feature row at or before each (entity_id, timestamp) key. The queries
+        # are gathered so Postgres executes them in parallel across connections
+        # instead of planning one K-way join; the engine's pool size bounds how
+        # many run at once.
+        async def fetch_feature(feature: str) -> pd.DataFrame:
+            query = (
+                f"SELECT DISTINCT ON (e.entity_id, e.timestamp)"  # nosec B608
+                f" e.entity_id, e.timestamp, f.{feature}"
+                f" FROM unnest($1::text[], $2::timestamp[]) AS e(entity_id, timestamp)"
+                f" JOIN {feature} f"
+                f" ON f.entity_id = e.entity_id AND f.timestamp <= e.timestamp"
+                f" ORDER BY e.entity_id, e.timestamp, f.timestamp DESC"
+            )
+            async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
+                raw_conn = await conn.get_raw_connection()
+                driver: Any = raw_conn.driver_connection
+                rows = await driver.fetch(query, entity_ids, timestamps)
+
+            # Map the SQL key columns back to the caller's names and index on
+            # them, with ids in the same Arrow-backed dtype as entity_df_norm.
+            feature_df = pd.DataFrame(
+                [tuple(r) for r in rows],
+                columns=[entity_id_col, timestamp_col, feature],
+            )
+            feature_df[entity_id_col] = feature_df[entity_id_col].astype(
+                "string[pyarrow]"
+            )
+            return feature_df.set_index([entity_id_col, timestamp_col])
+
+        feature_dfs = await asyncio.gather(*(fetch_feature(f) for f in features))
+
+        # 3. Join back onto the normalized entity_df by (entity_id, timestamp).
+        #
+        # DISTINCT ON makes each per-feature frame unique on its keys, so they
+        # align column-wise and every entity row is looked up once. The left
+        # join keeps all rows (and order) of entity_df_norm, whose timestamps
+        # were normalized to match the SQL side; clashing columns get _sql.
+        sql_df = pd.concat(feature_dfs, axis=1)
+        return entity_df_norm.join(
+            sql_df,
+            on=[entity_id_col, timestamp_col],
+            how="left",
+            rsuffix="_sql",
+        )
 
     async def execute_sql(self, query: str) -> pd.DataFrame:
         async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
@@ -204,10 +218,8 @@ class PostgresOfflineStore(OfflineStore):
         selects = []
         joins = ""
 
-        import re
-
         for feature in features:
-            if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", feature):
+            if not _FEATURE_NAME_RE.match(feature):
                 continue
 
             joins += (
@@ -227,26 +239,66 @@ class PostgresOfflineStore(OfflineStore):
         # Postgres VALUES syntax for virtual table: (VALUES ('id', 'ts'::timestamp)) as e(entity_id, timestamp)
         query = f"""
         SELECT {select_clause}
-        FROM (VALUES (:entity_id, :ts::timestamp)) as e(entity_id, timestamp)
+        FROM (VALUES ($1, $2::timestamp)) as e(entity_id, timestamp)
         {joins}
         """  # nosec
 
+        # Point lookups run straight on the asyncpg connection: no text()
+        # compilation or Row wrapping, and asyncpg caches the prepared statement.
         async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
-            result = await conn.execute(
-                text(query), {"entity_id": str(entity_id), "ts": timestamp}
-            )
-            row = result.fetchone()
+            raw_conn = await conn.get_raw_connection()
+            driver: Any = raw_conn.driver_connection
+            row = await driver.fetchrow(query, str(entity_id), timestamp)
             if row:
-                # Convert Row to dict
-                return dict(row._mapping)
+                return dict(row)
             return {}
 
-    async def create_index_table(self, index_name: str, dimension: int = 1536) -> None:
+    async def ensure_feature_indexes(
+        self, feature: str, column: Optional[str] = None
+    ) -> None:
+        """
+        Creates the point-in-time lookup index for a feature table.
+
+        Both get_historical_features (LATERAL ... ORDER BY timestamp DESC
+        LIMIT 1) and get_training_data (DISTINCT ON) read the latest row per
+        entity at or before a timestamp. A (entity_id, timestamp DESC) B-tree
+        that INCLUDEs the value column turns each lookup into an index-only
+        fetch instead of a scan of the feature table.
+        """
+        column = column or feature
+        for name in (feature, column):
+            if not _FEATURE_NAME_RE.match(name):
+                raise ValueError(f"Invalid feature name: {name}")
+
+        # CONCURRENTLY avoids locking out writers while the index builds, but
+        # cannot run inside a transaction block.
+        async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_{feature}_eid_ts"
+                    f" ON {feature} (entity_id, timestamp DESC)"
+                    f" INCLUDE ({column})"
+                )
+            )
+
+    async def create_index_table(
+        self, index_name: str, dimension: int = 1536, precision: str = "fp32"
+    ) -> None:
         """
         Creates the vector index table if it doesn't exist.
         Schema: id (UUID), entity_id, chunk_index, content, embedding, metadata.
         STRICT SCHEMA: Adds content_hash for deduplication.
+
+        precision="fp16" stores embeddings as halfvec (pgvector >= 0.7), halving
+        the bytes the HNSW index reads per probe at a small recall cost.
         """
+        vector_type = _VECTOR_TYPES.get(precision)
+        if vector_type is None:
+            raise ValueError(
+                f"Invalid precision {precision!r}. Must be one of {sorted(_VECTOR_TYPES)}."
+            )
+
         table_name = f"fabra_index_{index_name}"
         async with self.engine.begin() as conn:  # type: ignore[no-untyped-call]
             # Enable extension
@@ -262,7 +314,7 @@ class PostgresOfflineStore(OfflineStore):
                         chunk_index INTEGER NOT NULL,
                         content TEXT NOT NULL,
                         content_hash TEXT NOT NULL,
-                        embedding vector({dimension}),
+                        embedding {vector_type}({dimension}),
                         metadata JSONB DEFAULT '{{}}'::jsonb,
                         created_at TIMESTAMP DEFAULT NOW(),
                         UNIQUE (entity_id, content_hash)
@@ -278,7 +330,7 @@ class PostgresOfflineStore(OfflineStore):
                     f"""
                     CREATE INDEX IF NOT EXISTS {idx_name}
                     ON {table_name}
-                    USING hnsw (embedding vector_cosine_ops)
+                    USING hnsw (embedding {vector_type}_cosine_ops)
                     """
                 )
             )
@@ -295,49 +347,68 @@ class PostgresOfflineStore(OfflineStore):
         Inserts documents into the index.
         Computes content_hash and adds mandatory metadata.
         """
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", index_name):
+        if not _FEATURE_NAME_RE.match(index_name):
             raise ValueError(f"Invalid index name {index_name}. Must be alphanumeric.")
 
         table_name = f"fabra_index_{index_name}"
 
+        # Hash every chunk up front in one pass. Each chunk is encoded exactly
+        # once; content itself is sent as text so the bytes are not kept.
+        sha256 = hashlib.sha256
+        content_hashes = [sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+
+        # Mandatory metadata shares one ingestion timestamp per batch. Metadata
+        # is serialized with orjson straight to bytes, which COPY sends into the
+        # staging table's BYTEA column without a str round-trip.
+        ingestion_timestamp = datetime.now(timezone.utc).isoformat()
+        dumps = orjson.dumps
         values = []
-        for i, (chunk, vec) in enumerate(zip(chunks, embeddings)):
+        for i, (chunk, vec, content_hash) in enumerate(
+            zip(chunks, embeddings, content_hashes)
+        ):
             meta = metadatas[i] if metadatas and i < len(metadatas) else {}
-
-            # Compute hash
-            content_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
-
-            # Add Mandatory Metadata
-            meta["ingestion_timestamp"] = datetime.now(timezone.utc).isoformat()
-            meta["content_hash"] = content_hash
-            meta["indexer_version"] = "fabra-v1"
-
-            vec_str = str(vec)
-
-            values.append(
+            payload = dumps(
                 {
-                    "entity_id": entity_id,
-                    "chunk_index": i,
-                    "content": chunk,
+                    **meta,
+                    "ingestion_timestamp": ingestion_timestamp,
                     "content_hash": content_hash,
-                    "embedding": vec_str,
-                    "metadata": json.dumps(meta),
-                }
+                    "indexer_version": "fabra-v1",
+                },
+                option=orjson.OPT_NON_STR_KEYS,
             )
+            values.append((entity_id, i, chunk, content_hash, vec, payload))
+
+        if not values:
+            return
 
         async with self.engine.begin() as conn:  # type: ignore[no-untyped-call]
+            # Binary COPY the batch into the staging table in one round-trip,
+            # then let the server move it into the index with a single
+            # INSERT ... SELECT instead of one INSERT per chunk.
+            raw_conn = await conn.get_raw_connection()
+            driver: Any = raw_conn.driver_connection
+            # The temp table outlives the transaction, so it is created once
+            # per pooled connection; raw_conn.info lives as long as the DBAPI
+            # connection does.
+            if _INDEX_STAGE_TABLE not in raw_conn.info:
+                await driver.execute(_INDEX_STAGE_DDL)
+            await driver.copy_records_to_table(
+                _INDEX_STAGE_TABLE, records=values, columns=_INDEX_STAGE_COLUMNS
+            )
             # Use ON CONFLICT DO NOTHING to satisfy "prevent duplication" constraint
-            insert_query = f"""
-                    INSERT INTO {table_name} (entity_id, chunk_index, content, content_hash, embedding, metadata)
-                    VALUES (:entity_id, :chunk_index, :content, :content_hash, :embedding, :metadata)
-                    ON CONFLICT (entity_id, content_hash) DO NOTHING
-                    """  # nosec
-
-            await conn.execute(
-                text(insert_query),
-                values,
+            await driver.execute(
+                f"INSERT INTO {table_name}"  # nosec B608
+                " (entity_id, chunk_index, content, content_hash, embedding, metadata)"
+                " SELECT entity_id, chunk_index, content, content_hash,"
+                " embedding, convert_from(metadata, 'UTF8')::jsonb"
+                f" FROM {_INDEX_STAGE_TABLE}"
+                " ON CONFLICT (entity_id, content_hash) DO NOTHING"
             )
 
+        # Only mark the table as created once the transaction has committed;
+        # a rollback would also have rolled back the CREATE.
+        raw_conn.info[_INDEX_STAGE_TABLE] = True
+
     async def search(
         self,
         index_name: str,
@@ -349,35 +420,45 @@ class PostgresOfflineStore(OfflineStore):
         Performs vector similarity search (Cosine Distance via <=> operator).
         Returns list of dicts with content and metadata.
         """
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", index_name):
+        if not _FEATURE_NAME_RE.match(index_name):
             raise ValueError(f"Invalid index name {index_name}. Must be alphanumeric.")
 
         table_name = f"fabra_index_{index_name}"
-        vec_str = str(query_embedding)
 
+        # The embedding is bound as a list and sent through pgvector's binary
+        # codec rather than as a "[0.1, ...]" literal the server has to parse.
+        # Its type is inferred from the column, so fp16 (halfvec) indexes get a
+        # halfvec query and keep using their halfvec_cosine_ops HNSW index.
         where_clause = ""
-        params = {"query_vec": vec_str, "top_k": top_k}
+        args: List[Any] = [query_embedding, top_k]
 
         if filter_timestamp:
             # Filter by ingestion time (created_at)
-            where_clause = "WHERE created_at <= :ts"
-            params["ts"] = filter_timestamp
+            where_clause = "WHERE created_at <= $3"
+            args.append(filter_timestamp)
 
         query = f"""
-        SELECT content, metadata, 1 - (embedding <=> :query_vec) as score
+        SELECT content, metadata, 1 - (embedding <=> $1) as score
         FROM {table_name}
         {where_clause}
-        ORDER BY embedding <=> :query_vec
-        LIMIT :top_k
+        ORDER BY embedding <=> $1
+        LIMIT $2
         """  # nosec
 
+        # Like get_historical_features, this runs on the asyncpg connection
+        # directly; the pool's JSONB codec still decodes metadata to a dict.
         async with self.engine.connect() as conn:  # type: ignore[no-untyped-call]
-            result = await conn.execute(text(query), params)
-            rows = result.fetchall()
-            return [
-                {"content": r.content, "metadata": r.metadata, "score": r.score}
-                for r in rows
-            ]
+            raw_conn = await conn.get_raw_connection()
+            driver: Any = raw_conn.driver_connection
+            await self._register_vector_codec(raw_conn)
+            rows = await driver.fetch(query, *args)
+            return [dict(r) for r in rows]
+
+    async def _register_vector_codec(self, raw_conn: Any) -> None:
+        """Register pgvector's binary codec once per pooled connection."""
+        if _VECTOR_CODEC not in raw_conn.info:
+            await register_vector(raw_conn.driver_connection)
+            raw_conn.info[_VECTOR_CODEC] = True
 
     async def _ensure_context_table(self) -> None:
         """Create context_log table if it doesn't exist."""
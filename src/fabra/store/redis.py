@@ -1,9 +1,26 @@
 from typing import Dict, Any, List, Optional
 import redis.asyncio as redis
-import json
+import orjson
 from .online import OnlineStore, _wrap_feature_value
 from datetime import datetime, timezone
 
+# Feature values often come straight out of pandas/numpy, so numpy scalars and
+# arrays are serialized natively (NaN is written as null).
+_ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+# HSET the given field/value pairs and, when ARGV[1] > 0, EXPIRE the key in the
+# same server-side call. One EVALSHA replaces an HSET + EXPIRE pair, halving
+# pipeline length for TTL writes and closing the window where the hash exists
+# without its TTL.
+_HSET_EXPIRE_SCRIPT = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then
+    redis.call('EXPIRE', KEYS[1], ttl)
+end
+return 1
+"""
+
 
 class RedisOnlineStore(OnlineStore):
     def __init__(
@@ -30,6 +47,8 @@ class RedisOnlineStore(OnlineStore):
 
         self.connection_kwargs: Dict[str, Any]
         self._client: Optional[Any] = None
+        self._hset_expire: Optional[Any] = None
+        self._sync_client: Optional[Any] = None
         if redis_url:
             self.connection_kwargs = {"url": redis_url}
         else:
@@ -76,40 +95,51 @@ class RedisOnlineStore(OnlineStore):
         # Allows tests to inject a client (e.g., a testcontainers Redis client) and
         # avoids creating extra connections.
         self._client = value
+        self._hset_expire = None
+
+    def _get_hset_expire(self) -> Any:
+        # register_script computes the SHA locally; redis-py sends EVALSHA and
+        # loads the script on the first NOSCRIPT (or before a pipeline runs).
+        if self._hset_expire is None:
+            self._hset_expire = self._get_client().register_script(_HSET_EXPIRE_SCRIPT)
+        return self._hset_expire
 
     def get_sync_client(self) -> Any:
-        """Returns a synchronous Redis client for the scheduler."""
+        """Returns a synchronous Redis client for the scheduler.
+
+        The client is created once and backed by a ConnectionPool, so repeated
+        calls and threaded consumers share sockets instead of reconnecting.
+        """
+        if self._sync_client is not None:
+            return self._sync_client
+
         import redis as sync_redis
 
         if "url" in self.connection_kwargs:
-            return sync_redis.Redis.from_url(
+            pool = sync_redis.ConnectionPool.from_url(  # type: ignore[no-untyped-call]
                 self.connection_kwargs["url"], decode_responses=True
             )
+        else:
+            pool = sync_redis.ConnectionPool(
+                host=self.connection_kwargs["host"],
+                port=self.connection_kwargs["port"],
+                db=self.connection_kwargs["db"],
+                password=self.connection_kwargs["password"],
+                decode_responses=True,
+            )
 
-        return sync_redis.Redis(
-            host=self.connection_kwargs["host"],
-            port=self.connection_kwargs["port"],
-            db=self.connection_kwargs["db"],
-            password=self.connection_kwargs["password"],
-            decode_responses=True,
-        )
-
-    async def get_online_features(
-        self, entity_name: str, entity_id: str, feature_names: List[str]
-    ) -> Dict[str, Any]:
-        # Key format: "entity_name:entity_id"
-        key = f"{entity_name}:{entity_id}"
-
-        # Use HMGET to fetch specific fields
-        values = await self._get_client().hmget(key, feature_names)
+        self._sync_client = sync_redis.Redis(connection_pool=pool)
+        return self._sync_client
 
+    @staticmethod
+    def _decode_features(feature_names: List[str], values: List[Any]) -> Dict[str, Any]:
         result: Dict[str, Any] = {}
         for name, value in zip(feature_names, values):
             if value is not None:
                 # Redis stores strings, so we might need to infer types or store as JSON.
                 # For MVP, we'll try to parse as JSON, fallback to string.
                 try:
-                    parsed = json.loads(value)
+                    parsed = orjson.loads(value)
                     if (
                         isinstance(parsed, dict)
                         and parsed.get("__fabra_feature_value__") is True
@@ -117,10 +147,35 @@ class RedisOnlineStore(OnlineStore):
                         result[name] = parsed.get("value")
                     else:
                         result[name] = parsed
-                except (json.JSONDecodeError, TypeError):
+                except (orjson.JSONDecodeError, TypeError):
                     result[name] = value
         return result
 
+    async def get_online_features(
+        self, entity_name: str, entity_id: str, feature_names: List[str]
+    ) -> Dict[str, Any]:
+        # Key format: "entity_name:entity_id"
+        key = f"{entity_name}:{entity_id}"
+
+        # Use HMGET to fetch specific fields
+        values = await self._get_client().hmget(key, feature_names)
+        return self._decode_features(feature_names, values)
+
+    async def get_online_features_batch(
+        self, entity_name: str, entity_ids: List[str], feature_names: List[str]
+    ) -> List[Dict[str, Any]]:
+        if not entity_ids:
+            return []
+
+        # One HMGET per entity, sent in a single non-transactional pipeline so
+        # the whole batch costs one round-trip instead of one per entity.
+        async with self._get_client().pipeline(transaction=False) as pipe:
+            for entity_id in entity_ids:
+                pipe.hmget(f"{entity_name}:{entity_id}", feature_names)
+            rows = await pipe.execute()
+
+        return [self._decode_features(feature_names, values) for values in rows]
+
     async def get_online_features_with_meta(
         self, entity_name: str, entity_id: str, feature_names: List[str]
     ) -> Dict[str, Dict[str, Any]]:
@@ -131,7 +186,7 @@ class RedisOnlineStore(OnlineStore):
             if value is None:
                 continue
             try:
-                parsed = json.loads(value)
+                parsed = orjson.loads(value)
                 if (
                     isinstance(parsed, dict)
                     and parsed.get("__fabra_feature_value__") is True
@@ -139,7 +194,7 @@ class RedisOnlineStore(OnlineStore):
                     result[name] = parsed
                 else:
                     result[name] = _wrap_feature_value(parsed)
-            except (json.JSONDecodeError, TypeError):
+            except (orjson.JSONDecodeError, TypeError):
                 result[name] = _wrap_feature_value(value)
         return result
 
@@ -152,16 +207,19 @@ class RedisOnlineStore(OnlineStore):
     ) -> None:
         key = f"{entity_name}:{entity_id}"
 
-        # Convert values to JSON strings for storage
+        # Convert values to JSON for storage
         serialized_features = {}
         for k, v in features.items():
             wrapped = _wrap_feature_value(v, as_of=datetime.now(timezone.utc))
-            serialized_features[k] = json.dumps(wrapped)
-
-        await self._get_client().hset(key, mapping=serialized_features)
+            serialized_features[k] = orjson.dumps(wrapped, option=_ORJSON_OPTS)
 
         if ttl:
-            await self._get_client().expire(key, ttl)
+            args: List[Any] = [ttl]
+            for field, payload in serialized_features.items():
+                args += (field, payload)
+            await self._get_hset_expire()(keys=[key], args=args)
+        else:
+            await self._get_client().hset(key, mapping=serialized_features)
 
     async def set_online_features_bulk(
         self,
@@ -173,27 +231,35 @@ class RedisOnlineStore(OnlineStore):
     ) -> None:
         # Use a pipeline for bulk writes with batching
         BATCH_SIZE = 1000
-        async with self._get_client().pipeline() as pipe:
-            for i, (_, row) in enumerate(features_df.iterrows()):
-                entity_id = str(row[entity_id_col])
-                value = row[feature_name]
-                key = f"{entity_name}:{entity_id}"
-
-                # Serialize value
-                wrapped = _wrap_feature_value(value, as_of=datetime.now(timezone.utc))
-                serialized_value = json.dumps(wrapped)
-
-                # Add to pipeline
-                pipe.hset(key, feature_name, serialized_value)
-                if ttl:
-                    pipe.expire(key, ttl)
-
-                # Execute batch
-                if (i + 1) % BATCH_SIZE == 0:
-                    await pipe.execute()
-
-            # Execute remaining
-            await pipe.execute()
+
+        # Serialize every value up front, outside the pipeline loop. All rows in
+        # one bulk write share the same as_of timestamp.
+        as_of = datetime.now(timezone.utc)
+        entity_ids = features_df[entity_id_col].astype(str).tolist()
+        payloads = [
+            orjson.dumps(_wrap_feature_value(value, as_of=as_of), option=_ORJSON_OPTS)
+            for value in features_df[feature_name].tolist()
+        ]
+
+        # A fresh non-transactional pipeline per batch keeps the client-side
+        # command buffer bounded instead of re-executing one growing pipeline.
+        client = self._get_client()
+        hset_expire = self._get_hset_expire() if ttl else None
+        for start in range(0, len(entity_ids), BATCH_SIZE):
+            end = start + BATCH_SIZE
+            async with client.pipeline(transaction=False) as pipe:
+                for entity_id, payload in zip(
+                    entity_ids[start:end], payloads[start:end]
+                ):
+                    key = f"{entity_name}:{entity_id}"
+                    if hset_expire is not None:
+                        # Queues a single EVALSHA on the pipeline
+                        await hset_expire(
+                            keys=[key], args=[ttl, feature_name, payload], client=pipe
+                        )
+                    else:
+                        pipe.hset(key, feature_name, payload)
+                await pipe.execute()
 
     # --- Cache Primitives for Context API ---
     async def get(self, key: str) -> Any:
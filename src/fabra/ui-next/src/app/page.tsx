@@ -2,8 +2,8 @@
 
 import { useState, useEffect } from 'react';
 import useSWR from 'swr';
-import type { StoreInfo } from '@/types/api';
-import { getStoreInfo, getMermaidGraph } from '@/lib/api';
+import type { Bootstrap } from '@/types/api';
+import { getBootstrap } from '@/lib/api';
 import Sidebar from '@/components/Sidebar';
 import StoreTab from '@/components/StoreTab';
 import ContextTab from '@/components/ContextTab';
@@ -13,17 +13,14 @@ type Tab = 'store' | 'context';
 export default function Home() {
   const [activeTab, setActiveTab] = useState<Tab>('store');
 
-  const { data: storeInfo, error: storeError, isLoading } = useSWR<StoreInfo>(
-    '/api/store',
-    () => getStoreInfo(),
-    { revalidateOnFocus: false }
-  );
-
-  const { data: graphData } = useSWR(
-    '/api/graph',
-    () => getMermaidGraph(),
+  // Store info and graph arrive together in one request
+  const { data, error: storeError, isLoading } = useSWR<Bootstrap>(
+    '/api/bootstrap',
+    () => getBootstrap(),
     { revalidateOnFocus: false }
   );
+  const storeInfo = data?.store;
+  const graphData = data?.graph;
 
   if (isLoading) {
     return (
@@ -6,16 +6,17 @@ interface MermaidDiagramProps {
   code: string;
 }
 
-export default function MermaidDiagram({ code }: MermaidDiagramProps) {
-  const containerRef = useRef<HTMLDivElement>(null);
+// Last rendered diagram. The graph only changes when the registry does, so a
+// remount (e.g. switching tabs) reuses the SVG instead of re-running mermaid.
+let lastRender: { code: string; svg: string } | null = null;
 
-  useEffect(() => {
-    const renderDiagram = async () => {
-      if (!containerRef.current || !code) return;
-
-      // Dynamically import mermaid to avoid SSR issues
-      const mermaid = (await import('mermaid')).default;
+// Mermaid is imported and configured once per page load, on first use.
+let mermaidReady: Promise<typeof import('mermaid').default> | null = null;
 
+function loadMermaid() {
+  if (!mermaidReady) {
+    // Dynamically import mermaid to avoid SSR issues
+    mermaidReady = import('mermaid').then(({ default: mermaid }) => {
       mermaid.initialize({
         startOnLoad: false,
         theme: 'dark',
@@ -34,9 +35,29 @@ export default function MermaidDiagram({ code }: MermaidDiagramProps) {
           curve: 'basis',
         },
       });
+      return mermaid;
+    });
+  }
+  return mermaidReady;
+}
+
+export default function MermaidDiagram({ code }: MermaidDiagramProps) {
+  const containerRef = useRef<HTMLDivElement>(null);
+
+  useEffect(() => {
+    const renderDiagram = async () => {
+      if (!containerRef.current || !code) return;
+
+      if (lastRender?.code === code) {
+        containerRef.current.innerHTML = lastRender.svg;
+        return;
+      }
+
+      const mermaid = await loadMermaid();
 
       try {
         const { svg } = await mermaid.render('mermaid-diagram', code);
+        lastRender = { code, svg };
         containerRef.current.innerHTML = svg;
       } catch (error) {
         console.error('Mermaid rendering error:', error);
@@ -1,8 +1,11 @@
 import type {
   StoreInfo,
   FeatureValues,
+  FeatureLookup,
+  FeatureLookupResult,
   ContextResult,
   MermaidGraph,
+  Bootstrap,
   ContextDiff,
 } from '@/types/api';
 
@@ -38,6 +41,15 @@ export async function getFeatures(
   );
 }
 
+export async function getFeaturesBatch(
+  lookups: FeatureLookup[]
+): Promise<FeatureLookupResult[]> {
+  return fetchAPI<FeatureLookupResult[]>('/features/batch', {
+    method: 'POST',
+    body: JSON.stringify(lookups),
+  });
+}
+
 export async function assembleContext(
   contextName: string,
   params: Record<string, string>
@@ -52,6 +64,10 @@ export async function getMermaidGraph(): Promise<MermaidGraph> {
   return fetchAPI<MermaidGraph>('/graph');
 }
 
+export async function getBootstrap(): Promise<Bootstrap> {
+  return fetchAPI<Bootstrap>('/bootstrap');
+}
+
 export async function getContextDiff(
   baseId: string,
   comparisonId: string
@@ -99,10 +99,24 @@ export interface FeatureValues {
   [key: string]: unknown;
 }
 
+export interface FeatureLookup {
+  entity: string;
+  id: string;
+}
+
+export interface FeatureLookupResult extends FeatureLookup {
+  features: FeatureValues;
+}
+
 export interface MermaidGraph {
   code: string;
 }
 
+export interface Bootstrap {
+  store: StoreInfo;
+  graph: MermaidGraph;
+}
+
 // Context diff types
 export interface FeatureDiff {
   feature_name: string;
@@ -5,22 +5,32 @@ with Fabra.s Feature Store and Context Store.
 """
 
 import asyncio
+import functools
+import hashlib
 import importlib.util
 import inspect
+import io
 import os
 import sys
 import warnings
-from typing import Any, Dict, List, Optional
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import Depends, FastAPI, HTTPException
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import APIKeyHeader
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from fabra.core import FeatureStore
 from fabra.store import InMemoryOnlineStore, DuckDBOfflineStore
 
-app = FastAPI(title="Fabra UI API", version="0.1.0")
+app = FastAPI(
+    title="Fabra UI API", version="0.1.0", default_response_class=ORJSONResponse
+)
 
 # CORS middleware for development
 app.add_middleware(
@@ -40,12 +50,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Mermaid code and store metadata are repetitive text that compresses well
+app.add_middleware(GZipMiddleware, minimum_size=512)
+
 # Global state for loaded module
 _state: Dict[str, Any] = {
     "store": None,
     "contexts": {},
     "retrievers": {},
     "file_path": "",
+    "store_info": None,  # (source objects, StoreInfo, JSON, ETag) for the store
     "context_records": {},  # In-memory storage for Context Records (demo only)
 }
 
@@ -140,6 +154,22 @@ class MermaidGraph(BaseModel):
     code: str
 
 
+class Bootstrap(BaseModel):
+    store: StoreInfo
+    graph: MermaidGraph
+
+
+class FeatureLookup(BaseModel):
+    entity: str
+    id: str
+
+
+class FeatureLookupResult(BaseModel):
+    entity: str
+    id: str
+    features: Dict[str, Any]
+
+
 class ContextResultItem(BaseModel):
     content: str
     priority: int
@@ -246,69 +276,18 @@ class VerificationResult(BaseModel):
 # =============================================================================
 
 
-def load_module(file_path: str) -> None:
-    """Load a Python module and extract Fabra objects."""
-    global _state
-
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    spec = importlib.util.spec_from_file_location("features", file_path)
-    if not spec or not spec.loader:
-        raise ValueError(f"Could not load module: {file_path}")
-
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["features"] = module
-    spec.loader.exec_module(module)
-
-    store = None
-    contexts = {}
-    retrievers = {}
-
-    for attr_name in dir(module):
-        attr = getattr(module, attr_name)
-
-        if isinstance(attr, FeatureStore):
-            store = attr
-
-        if hasattr(attr, "_is_context") and attr._is_context:
-            contexts[attr_name] = attr
-
-        if hasattr(attr, "_fabra_retriever"):
-            retrievers[attr_name] = getattr(attr, "_fabra_retriever")
-
-    if not store:
-        raise ValueError("No FeatureStore instance found in the provided file.")
-
-    # Emit warning for InMemoryOnlineStore (Phase 5)
-    if isinstance(store.online_store, InMemoryOnlineStore):
-        warnings.warn(
-            "Using InMemoryOnlineStore - data will be lost on restart. "
-            "Set FABRA_ENV=production for persistent storage.",
-            UserWarning,
-            stacklevel=2,
-        )
-
-    _state["store"] = store
-    _state["contexts"] = contexts
-    _state["retrievers"] = retrievers
-    _state["file_path"] = file_path
-
-
-# =============================================================================
-# API Endpoints
-# =============================================================================
-
-
-@app.get("/api/store", response_model=StoreInfo)
-async def get_store_info(
-    _api_key: Optional[str] = Depends(_get_api_key),
+def _build_store_info(
+    store: FeatureStore,
+    context_funcs: Dict[str, Any],
+    retriever_objs: Dict[str, Any],
+    file_path: str,
 ) -> StoreInfo:
-    """Get information about the loaded Feature Store."""
-    store = _state["store"]
-    if not store:
-        raise HTTPException(status_code=503, detail="No store loaded")
+    """Describe a loaded store for the frontend.
 
+    The registry doesn't change after load, so this runs once per load_module
+    rather than on every GET /api/store (it reflects over every context
+    function's signature).
+    """
     # Build entities list
     entities = []
     for name, entity in store.registry.entities.items():
@@ -336,7 +315,7 @@ async def get_store_info(
 
     # Build contexts list
     contexts = []
-    for ctx_name, ctx_func in _state["contexts"].items():
+    for ctx_name, ctx_func in context_funcs.items():
         sig = inspect.signature(ctx_func)
         params = []
         for param_name, param in sig.parameters.items():
@@ -372,7 +351,7 @@ async def get_store_info(
 
     # Build retrievers list with mock detection
     retrievers = []
-    for r_name, r_obj in _state["retrievers"].items():
+    for r_name, r_obj in retriever_objs.items():
         # Detect if retriever has a real index (not mock)
         index_name = getattr(r_obj, "index", None)
         is_mock = index_name is None
@@ -387,7 +366,7 @@ async def get_store_info(
         )
 
     return StoreInfo(
-        file_name=os.path.basename(_state["file_path"]),
+        file_name=os.path.basename(file_path),
         entities=entities,
         features=features,
         contexts=contexts,
@@ -399,17 +378,133 @@ async def get_store_info(
     )
 
 
-@app.get("/api/features/{entity_name}/{entity_id}")
-async def get_features(
-    entity_name: str,
-    entity_id: str,
-    _api_key: Optional[str] = Depends(_get_api_key),
-) -> Dict[str, Any]:
-    """Fetch feature values for an entity."""
-    store = _state["store"]
+# Loaded feature files keyed by (absolute path, mtime in ns). Re-loading an
+# unchanged file reuses the module and the objects found in it instead of
+# re-executing it (and re-creating its store connections).
+LoadedModule = Tuple[ModuleType, Optional[FeatureStore], Dict[str, Any], Dict[str, Any]]
+_MODULE_CACHE: Dict[Tuple[str, int], LoadedModule] = {}
+
+
+def _exec_module(file_path: str) -> LoadedModule:
+    """Execute a feature file and collect its store, contexts and retrievers."""
+    spec = importlib.util.spec_from_file_location("features", file_path)
+    if not spec or not spec.loader:
+        raise ValueError(f"Could not load module: {file_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["features"] = module
+    spec.loader.exec_module(module)
+
+    # A top-level STORE wins; otherwise the first FeatureStore defined
+    marked = getattr(module, "STORE", None)
+    store = marked if isinstance(marked, FeatureStore) else None
+    contexts = {}
+    retrievers = {}
+
+    # One pass over the module's own namespace (dir() also sorts and
+    # resolves every name through getattr)
+    for attr_name, attr in vars(module).items():
+        if store is None and isinstance(attr, FeatureStore):
+            store = attr
+        elif getattr(attr, "_is_context", False):
+            contexts[attr_name] = attr
+        elif hasattr(attr, "_fabra_retriever"):
+            retrievers[attr_name] = attr._fabra_retriever
+
+    return module, store, contexts, retrievers
+
+
+def load_module(file_path: str) -> None:
+    """Load a Python module and extract Fabra objects."""
+    global _state
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_path}")
+
+    abs_path = os.path.abspath(file_path)
+    key = (abs_path, os.stat(file_path).st_mtime_ns)
+    loaded = _MODULE_CACHE.get(key)
+    if loaded is None:
+        loaded = _exec_module(file_path)
+        # Drop the entry for the file's previous version
+        for stale in [k for k in _MODULE_CACHE if k[0] == abs_path]:
+            del _MODULE_CACHE[stale]
+        _MODULE_CACHE[key] = loaded
+    else:
+        sys.modules["features"] = loaded[0]
+
+    _module, store, contexts, retrievers = loaded
+
+    if not store:
+        raise ValueError("No FeatureStore instance found in the provided file.")
+
+    # Emit warning for InMemoryOnlineStore (Phase 5)
+    if isinstance(store.online_store, InMemoryOnlineStore):
+        warnings.warn(
+            "Using InMemoryOnlineStore - data will be lost on restart. "
+            "Set FABRA_ENV=production for persistent storage.",
+            UserWarning,
+            stacklevel=2,
+        )
+
+    _state["store"] = store
+    _state["contexts"] = contexts
+    _state["retrievers"] = retrievers
+    _state["file_path"] = file_path
+    _current_store_info()
+
+
+# =============================================================================
+# API Endpoints
+# =============================================================================
+
+
+def _current_store_info() -> Tuple[StoreInfo, bytes, str]:
+    """StoreInfo, its JSON body and ETag, rebuilt only when the loaded objects change."""
+    store = _state.get("store")
     if not store:
         raise HTTPException(status_code=503, detail="No store loaded")
 
+    source = (store, _state["contexts"], _state["retrievers"], _state["file_path"])
+    cached = _state.get("store_info")
+    if (
+        cached is None
+        or any(a is not b for a, b in zip(cached[0][:3], source[:3]))
+        or cached[0][3] != source[3]
+    ):
+        info = _build_store_info(*source)
+        body = info.model_dump_json().encode()
+        digest = hashlib.sha256(body).hexdigest()
+        cached = (source, info, body, f'W/"{digest[:16]}"')
+        _state["store_info"] = cached
+    return cached[1], cached[2], cached[3]
+
+
+@app.get("/api/store", response_model=StoreInfo)
+async def get_store_info(
+    request: Request,
+    _api_key: Optional[str] = Depends(_get_api_key),
+) -> Response:
+    """Get information about the loaded Feature Store.
+
+    Served with an ETag so unchanged polls get a 304.
+    """
+    _info, body, etag = _current_store_info()
+
+    # The payload only changes when a new file version is loaded, so the
+    # frontend's polls can revalidate with If-None-Match and get a 304.
+    # no-cache makes the browser revalidate every time, so a reload shows up
+    # on the next poll instead of after a max-age window.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def _lookup_features(
+    store: FeatureStore, entity_name: str, entity_id: str
+) -> Dict[str, Any]:
     if entity_name not in store.registry.entities:
         raise HTTPException(status_code=404, detail=f"Entity not found: {entity_name}")
 
@@ -425,19 +520,77 @@ async def get_features(
             entity_id=entity_id,
             features=feature_names,
         )
-        # Convert to JSON-serializable format
-        return {k: _serialize_value(v) for k, v in values.items()}
+        return values
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _serialize_value(value: Any) -> Any:
-    """Convert value to JSON-serializable format."""
+@app.get("/api/features/{entity_name}/{entity_id}")
+async def get_features(
+    entity_name: str,
+    entity_id: str,
+    _api_key: Optional[str] = Depends(_get_api_key),
+) -> Response:
+    """Fetch feature values for an entity."""
+    store = _state["store"]
+    if not store:
+        raise HTTPException(status_code=503, detail="No store loaded")
+
+    return _feature_response(await _lookup_features(store, entity_name, entity_id))
+
+
+# Same knob as the serving API's batch endpoint
+_BATCH_CONCURRENCY = int(os.getenv("FABRA_BATCH_CONCURRENCY", "32"))
+
+
+@app.post("/api/features/batch", response_model=List[FeatureLookupResult])
+async def get_features_batch(
+    lookups: List[FeatureLookup],
+    _api_key: Optional[str] = Depends(_get_api_key),
+) -> Response:
+    """Fetch feature values for several entities in one request.
+
+    Lookups run concurrently, at most FABRA_BATCH_CONCURRENCY at a time, and
+    results come back in request order.
+    """
+    store = _state["store"]
+    if not store:
+        raise HTTPException(status_code=503, detail="No store loaded")
+
+    semaphore = asyncio.Semaphore(_BATCH_CONCURRENCY)
+
+    async def lookup_one(lookup: FeatureLookup) -> Dict[str, Any]:
+        async with semaphore:
+            return await _lookup_features(store, lookup.entity, lookup.id)
+
+    values = await asyncio.gather(*(lookup_one(lookup) for lookup in lookups))
+    return _feature_response(
+        [
+            {"entity": lookup.entity, "id": lookup.id, "features": features}
+            for lookup, features in zip(lookups, values)
+        ]
+    )
+
+
+def _orjson_default(value: Any) -> Any:
+    """Fallback for feature values orjson can't serialize natively."""
     if hasattr(value, "model_dump"):
         return value.model_dump()
-    if hasattr(value, "__dict__"):
-        return str(value)
-    return value
+    return str(value)
+
+
+def _feature_response(content: Any) -> Response:
+    """Serialize raw feature values in one orjson pass (numpy included)."""
+    return Response(
+        content=orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_PASSTHROUGH_DATACLASS,
+        ),
+        media_type="application/json",
+    )
 
 
 @app.post("/api/context/{context_name}", response_model=ContextResult)
@@ -458,7 +611,8 @@ async def assemble_context(
         if asyncio.iscoroutinefunction(ctx_func):
             result = await ctx_func(**params)
         else:
-            result = ctx_func(**params)
+            # Keep sync context functions off the event loop
+            result = await run_in_threadpool(ctx_func, **params)
 
         # Convert result to response model
         items = []
@@ -536,52 +690,109 @@ async def assemble_context(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/graph", response_model=MermaidGraph)
-async def get_mermaid_graph(
-    _api_key: Optional[str] = Depends(_get_api_key),
-) -> MermaidGraph:
-    """Generate Mermaid diagram code for the Feature Store."""
-    store = _state["store"]
-    if not store:
-        raise HTTPException(status_code=503, detail="No store loaded")
+# (entity name, ((feature name, materialize), ...)) per entity, in registry order
+RegistryFingerprint = Tuple[Tuple[str, Tuple[Tuple[str, bool], ...]], ...]
 
-    # Build Mermaid graph
-    graph = ["graph LR"]
-    graph.append(
-        "    classDef entity fill:#1f2937,stroke:#10b981,stroke-width:2px,color:#f9fafb;"
-    )
-    graph.append(
-        "    classDef feature fill:#111827,stroke:#3b82f6,stroke-width:1px,color:#d1d5db;"
-    )
-    graph.append(
-        "    classDef store fill:#1f2937,stroke:#f59e0b,stroke-width:2px,color:#f9fafb;"
+
+def _registry_fingerprint(store: FeatureStore) -> RegistryFingerprint:
+    """Hashable summary of everything the Mermaid graph depends on."""
+    return tuple(
+        (
+            name,
+            tuple(
+                (f.name, f.materialize)
+                for f in store.registry.get_features_for_entity(name)
+            ),
+        )
+        for name in store.registry.entities
     )
 
-    os_type = store.online_store.__class__.__name__
-    graph.append(f"    OS[({os_type})]")
-    graph.append("    class OS store;")
 
-    for name, ent in store.registry.entities.items():
+# Above this many characters Mermaid's default maxTextSize rejects the diagram
+_MERMAID_LARGE_GRAPH_CHARS = 50_000
+
+_MERMAID_HEADER = (
+    "graph LR\n"
+    "    classDef entity fill:#1f2937,stroke:#10b981,stroke-width:2px,color:#f9fafb;\n"
+    "    classDef feature fill:#111827,stroke:#3b82f6,stroke-width:1px,color:#d1d5db;\n"
+    "    classDef store fill:#1f2937,stroke:#f59e0b,stroke-width:2px,color:#f9fafb;\n"
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_mermaid_graph(
+    online_store_type: str, fingerprint: RegistryFingerprint
+) -> str:
+    """Render Mermaid code for a registry; cached until the registry changes."""
+    buf = io.StringIO()
+    w = buf.write
+    w(_MERMAID_HEADER)
+    w(f"    OS[({online_store_type})]\n    class OS store;")
+
+    for name, feats in fingerprint:
         safe_name = name.replace(" ", "_")
         ent_id = f"ENT_{safe_name}"
-        graph.append(f"    subgraph {safe_name}")
-        graph.append(f"        {ent_id}[{name}]")
-        graph.append(f"        class {ent_id} entity;")
+        w(
+            f"\n    subgraph {safe_name}"
+            f"\n        {ent_id}[{name}]"
+            f"\n        class {ent_id} entity;"
+        )
+
+        for feat_name, materialize in feats:
+            feat_node = "FEAT_" + feat_name.replace(" ", "_")
+            w(
+                f"\n        {feat_node}({feat_name})"
+                f"\n        class {feat_node} feature;"
+                f"\n        {ent_id} --> {feat_node}"
+            )
+            if materialize:
+                w(f"\n        {feat_node} -. Materialize .-> OS")
+
+        w("\n    end")
 
-        feats = store.registry.get_features_for_entity(name)
-        for f in feats:
-            safe_feat = f.name.replace(" ", "_")
-            feat_node = f"FEAT_{safe_feat}"
-            graph.append(f"        {feat_node}({f.name})")
-            graph.append(f"        class {feat_node} feature;")
-            graph.append(f"        {ent_id} --> {feat_node}")
+    return buf.getvalue()
 
-            if f.materialize:
-                graph.append(f"        {feat_node} -. Materialize .-> OS")
 
-        graph.append("    end")
+def _graph_code() -> str:
+    store = _state.get("store")
+    if not store:
+        raise HTTPException(status_code=503, detail="No store loaded")
+    return _build_mermaid_graph(
+        store.online_store.__class__.__name__, _registry_fingerprint(store)
+    )
+
+
+@app.get("/api/graph", response_model=MermaidGraph)
+async def get_mermaid_graph(
+    _api_key: Optional[str] = Depends(_get_api_key),
+) -> Response:
+    """Generate Mermaid diagram code for the Feature Store.
+
+    Graphs too large to render in one go are flagged in a response header.
+    """
+    code = _graph_code()
+    headers = {}
+    if len(code) > _MERMAID_LARGE_GRAPH_CHARS:
+        # Lets the client fall back to a paginated view instead of failing
+        headers["X-Fabra-Graph-Large"] = str(len(code))
+    return Response(
+        content=orjson.dumps({"code": code}),
+        media_type="application/json",
+        headers=headers,
+    )
 
-    return MermaidGraph(code="\n".join(graph))
+
+@app.get("/api/bootstrap", response_model=Bootstrap)
+async def get_bootstrap(
+    _api_key: Optional[str] = Depends(_get_api_key),
+) -> Response:
+    """Store info and Mermaid graph in one response for the initial page load."""
+    _info, store_body, _etag = _current_store_info()
+    graph_body = orjson.dumps({"code": _graph_code()})
+    return Response(
+        content=b'{"store":' + store_body + b',"graph":' + graph_body + b"}",
+        media_type="application/json",
+    )
 
 
 @app.get("/api/context/{context_id}/record", response_model=ContextRecordResponse)
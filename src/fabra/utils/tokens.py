@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Any
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import os
 import structlog
 import functools
 
@@ -12,11 +14,20 @@ class TokenCounter(ABC):
         """Count tokens in text."""
         pass
 
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens in each of texts."""
+        return [self.count(text) for text in texts]
+
 
 class OpenAITokenCounter(TokenCounter):
+    # Context assembly re-counts the same system prompts and templates, so
+    # recent counts are kept in a bounded LRU keyed by text.
+    cache_size = 1024
+
     def __init__(self, model: str = "gpt-4o"):
         self.model = model
         self.encoder: Optional[Any] = None
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
         try:
             import tiktoken
 
@@ -25,15 +36,65 @@ class OpenAITokenCounter(TokenCounter):
             logger.warning(f"Failed to load tiktoken for {model}: {e}")
             self.encoder = None
 
+    def _remember(self, text: str, n: int) -> None:
+        self._cache[text] = n
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
     def count(self, text: str) -> int:
         if not self.encoder:
             # Fallback estimation: chars / 4
             return len(text) // 4
-        try:
-            return len(self.encoder.encode(text))
-        except Exception as e:
-            logger.error(f"Token count error: {e}")
-            return len(text) // 4
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+
+        # encode_ordinary treats special-token text as plain text instead of
+        # raising, so no error handling is needed on this path.
+        n = len(self.encoder.encode_ordinary(text))
+        self._remember(text, n)
+        return n
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        if not self.encoder:
+            return [len(text) // 4 for text in texts]
+
+        counts: List[int] = []
+        misses: List[int] = []
+        for i, text in enumerate(texts):
+            cached = self._cache.get(text)
+            if cached is None:
+                misses.append(i)
+                counts.append(0)
+            else:
+                self._cache.move_to_end(text)
+                counts.append(cached)
+
+        if misses:
+            # One call into tiktoken's Rust core, which encodes in parallel
+            # without the GIL.
+            encoded = self.encoder.encode_ordinary_batch([texts[i] for i in misses])
+            for i, tokens in zip(misses, encoded):
+                counts[i] = len(tokens)
+                self._remember(texts[i], counts[i])
+        return counts
+
+
+# One Anthropic client (and so one HTTP connection pool) per SDK class and
+# API key, shared by every counter and cached count lookup.
+_ANTHROPIC_CLIENTS: Dict[Tuple[Any, str], Any] = {}
+
+
+def _anthropic_client() -> Any:
+    from anthropic import Anthropic
+
+    key = (Anthropic, os.environ.get("ANTHROPIC_API_KEY", ""))
+    client = _ANTHROPIC_CLIENTS.get(key)
+    if client is None:
+        client = _ANTHROPIC_CLIENTS[key] = Anthropic()
+    return client
 
 
 class AnthropicTokenCounter(TokenCounter):
@@ -41,9 +102,7 @@ class AnthropicTokenCounter(TokenCounter):
         self.model = model
         self.client = None
         try:
-            from anthropic import Anthropic
-
-            self.client = Anthropic()
+            self.client = _anthropic_client()
         except Exception as e:
             logger.warning(f"Failed to load anthropic SDK: {e}")
 
@@ -57,14 +116,10 @@ class AnthropicTokenCounter(TokenCounter):
 @functools.lru_cache(maxsize=1024)
 def _get_anthropic_token_count(model: str, text: str) -> int:
     try:
-        # We instantiate client here (stateless mostly) to avoid passing 'self'
-        from anthropic import Anthropic
-
-        client = Anthropic()
-        response = client.beta.messages.count_tokens(
+        response = _anthropic_client().beta.messages.count_tokens(
             model=model, messages=[{"role": "user", "content": text}]
         )
-        return response.input_tokens
+        return int(response.input_tokens)
     except Exception as e:
         logger.error(f"Anthropic token count error: {e}")
         return len(text) // 4
@@ -1,14 +1,51 @@
 import asyncio
+import functools
+import inspect
 import structlog
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import TypeAdapter
 from redis.asyncio import Redis
 from fabra.events import AxiomEvent
 from fabra.core import FeatureStore
 
 logger = structlog.get_logger()
 
+# One core validator for every message instead of resolving it off the class
+_EVENT_ADAPTER: TypeAdapter[AxiomEvent] = TypeAdapter(AxiomEvent)
+
+# Stream names, message ids and field keys are bytes on the worker's own
+# connections (no decode_responses) and str on a shared online-store client.
+StreamValue = Union[str, bytes]
+
+
+def _text(value: StreamValue) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@functools.lru_cache(maxsize=None)
+def _call_convention(func: Callable[..., Any]) -> Tuple[bool, bool]:
+    """Whether a triggered feature takes `event` and/or `payload` keywords.
+
+    Computed once per function rather than inspecting the signature for
+    every message.
+    """
+    params = inspect.signature(func).parameters
+    return "event" in params, "payload" in params
+
+
+def _redis_from_store(online_store: Any) -> Optional[Any]:
+    """The Redis client an online store exposes, if any."""
+    client = getattr(online_store, "client", None)
+    if client is None:
+        client = getattr(online_store, "redis", None)
+    return client
+
 
 class AxiomWorker:
+    # Pending messages idle this long belong to a consumer that stopped
+    reclaim_min_idle_ms = 60_000
+    reclaim_interval_s = 30.0
+
     def __init__(
         self,
         redis_url: Optional[str] = None,
@@ -17,37 +54,22 @@ class AxiomWorker:
         streams: Optional[list[str]] = None,
         listen_all: bool = False,
     ):
-        self.store: Optional[FeatureStore] = None
-        if store:
-            # Prefer store's redis if available
-            if hasattr(store.online_store, "client"):
-                self.redis = store.online_store.client
-            elif hasattr(store.online_store, "redis"):
-                self.redis = store.online_store.redis
-            elif redis_url:
-                self.redis = Redis.from_url(redis_url, decode_responses=True)
-            else:
-                # Fallback if store doesn't expose redis directly?
-                # ideally we have it.
-                pass
-
-        # If no store provided, or store didn't give redis, look at redis_url
-        if not hasattr(self, "redis"):
+        # Prefer the online store's Redis client, then an explicit URL, then
+        # the configured store, then the configured URL.
+        redis = _redis_from_store(store.online_store) if store else None
+        if redis is None:
             if redis_url:
-                self.redis = Redis.from_url(redis_url, decode_responses=True)
+                redis = Redis.from_url(redis_url)
             else:
                 from fabra.config import get_store_factory
 
                 _, online_store = get_store_factory()
-                if hasattr(online_store, "client"):
-                    self.redis = online_store.client
-                elif hasattr(online_store, "redis"):
-                    self.redis = online_store.redis
-                else:
+                redis = _redis_from_store(online_store)
+                if redis is None:
                     from fabra.config import get_redis_url
 
-                    url = get_redis_url()
-                    self.redis = Redis.from_url(url, decode_responses=True)
+                    redis = Redis.from_url(get_redis_url())
+        self.redis = redis
 
         self.store = store
         self.group_name = "axiom_workers"
@@ -56,6 +78,7 @@ class AxiomWorker:
         from uuid import uuid4
 
         self.consumer_name = f"worker_{uuid4().hex[:8]}"
+        self._reclaim_cursor: Dict[str, StreamValue] = {}
 
     async def setup(self) -> None:
         """Ensure consumer group exists for all known event types."""
@@ -83,14 +106,22 @@ class AxiomWorker:
             except Exception as e:
                 # Ignore if group already exists
                 if "BUSYGROUP" not in str(e):
-                    logger.warning(f"Error creating group for {stream}: {e}")
+                    logger.warning(
+                        "stream_group_create_failed", stream=stream, error=str(e)
+                    )
 
     async def run(self) -> None:
         await self.setup()
-        logger.info(f"AxiomWorker started. Listening on {self.streams}")
+        logger.info("worker_started", streams=self.streams)
 
+        loop = asyncio.get_running_loop()
+        last_reclaim = float("-inf")
         try:
             while True:
+                if loop.time() - last_reclaim >= self.reclaim_interval_s:
+                    await self.reclaim_pending()
+                    last_reclaim = loop.time()
+
                 # Block for 1 second
                 streams_dict = {s: ">" for s in self.streams}
                 results = await self.redis.xreadgroup(
@@ -105,93 +136,196 @@ class AxiomWorker:
                     continue
 
                 for stream_name, messages in results:
-                    for message_id, fields in messages:
-                        await self.process_message(stream_name, message_id, fields)
+                    await self.process_batch(_text(stream_name), messages)
 
         except asyncio.CancelledError:
-            logger.info("Worker stopping...")
+            logger.info("worker_stopping")
         finally:
             await self.redis.aclose()
 
+    async def reclaim_pending(self) -> None:
+        """Take over messages left unacknowledged by stopped consumers.
+
+        XREADGROUP with ">" only delivers new entries, so without this a
+        crashed worker's pending messages would never be processed.
+        """
+        for stream in self.streams:
+            try:
+                next_id, claimed, *_ = await self.redis.xautoclaim(
+                    stream,
+                    self.group_name,
+                    self.consumer_name,
+                    min_idle_time=self.reclaim_min_idle_ms,
+                    start_id=self._reclaim_cursor.get(stream, "0-0"),
+                    count=100,
+                )
+            except Exception as e:
+                logger.warning("stream_reclaim_failed", stream=stream, error=str(e))
+                continue
+
+            self._reclaim_cursor[stream] = next_id
+            # Entries deleted from the stream come back without fields
+            messages = [(msg_id, fields) for msg_id, fields in claimed if fields]
+            if messages:
+                logger.info("stream_reclaimed", stream=stream, count=len(messages))
+                await self.process_batch(stream, messages)
+
     async def process_message(
-        self, stream: str, msg_id: str, fields: Dict[str, Any]
+        self, stream: str, msg_id: StreamValue, fields: Dict[Any, Any]
     ) -> None:
-        try:
-            data_str = fields.get("data")
-            if not data_str:
-                logger.warning(f"Missing data in message {msg_id}")
-                await self.ack(stream, msg_id)
-                return
-
-            # Parse Event
-            event = AxiomEvent.model_validate_json(data_str)
-            logger.info(f"Processing event from {stream}: {msg_id}")
-
-            # TRIGGER LOGIC
-            if self.store:
-                triggered_features = self.store.registry.get_features_by_trigger(
-                    event.event_type
-                )
+        await self.process_batch(stream, [(msg_id, fields)])
+
+    async def process_batch(
+        self, stream: str, messages: List[Tuple[StreamValue, Dict[Any, Any]]]
+    ) -> None:
+        """Process one XREADGROUP batch from a stream.
 
-                if not triggered_features:
-                    logger.info(f"No features triggered by {event.event_type}")
+        Events are applied in order, so a later event for the same entity and
+        feature wins. Each (entity, entity_id) is then written once, all
+        writes run concurrently, and the batch is acknowledged with a single
+        multi-id XACK instead of one round-trip per message.
+        """
+        updates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        to_ack: List[StreamValue] = []
 
-                for feature in triggered_features:
-                    logger.info(
-                        f"Triggering feature {feature.name} for entity {event.entity_id}"
+        for msg_id, fields in messages:
+            try:
+                # Only "data" is read, and validate_json takes bytes as-is
+                data = fields.get(b"data") or fields.get("data")
+                if not data:
+                    logger.warning(
+                        "event_missing_data", stream=stream, msg_id=_text(msg_id)
                     )
-                    try:
-                        # 1. Compute Result
-                        import inspect
-
-                        sig = inspect.signature(feature.func)
-                        kwargs: Dict[str, Any] = {}
-                        if "event" in sig.parameters:
-                            kwargs["event"] = event
-                        if "payload" in sig.parameters:
-                            kwargs["payload"] = event.payload
-
-                        val = feature.func(event.entity_id, **kwargs)
-
-                        # 2. Write to Online Store
-                        await self.store.online_store.set_online_features(
-                            entity_name=feature.entity_name,
-                            entity_id=event.entity_id,
-                            features={feature.name: val},
-                        )
-                        logger.info(f"Updated {feature.name}:{event.entity_id} = {val}")
-
-                    except Exception as e:
-                        logger.error(f"Error computing feature {feature.name}: {e}")
-            else:
-                logger.warning("No Store provided to worker. Cannot look up triggers.")
+                    to_ack.append(msg_id)
+                    continue
 
-            await self.ack(stream, msg_id)
+                # Parse Event
+                event = _EVENT_ADAPTER.validate_json(data)
+                logger.info("event_received", stream=stream, msg_id=_text(msg_id))
 
-        except Exception as e:
-            logger.error(f"Failed to process message {msg_id}: {e}")
+                # TRIGGER LOGIC
+                if self.store:
+                    self._compute_features(event, updates)
+                else:
+                    logger.warning("worker_has_no_store", stream=stream)
+
+                to_ack.append(msg_id)
+
+            except Exception as e:
+                logger.error(
+                    "event_processing_failed",
+                    stream=stream,
+                    msg_id=_text(msg_id),
+                    error=str(e),
+                )
+                if await self._dead_letter(stream, msg_id, fields, e):
+                    # Acknowledge original message so we don't loop forever
+                    to_ack.append(msg_id)
+
+        # Write to Online Store
+        await asyncio.gather(
+            *(
+                self._write_features(entity_name, entity_id, values)
+                for (entity_name, entity_id), values in updates.items()
+            )
+        )
+
+        if to_ack:
+            await self.ack(stream, *to_ack)
+
+    def _compute_features(
+        self,
+        event: AxiomEvent,
+        updates: Dict[Tuple[str, str], Dict[str, Any]],
+    ) -> None:
+        """Run the features triggered by an event into updates."""
+        if not self.store:
+            return
+
+        triggered_features = self.store.registry.get_features_by_trigger(
+            event.event_type
+        )
+
+        if not triggered_features:
+            logger.info("no_features_triggered", event_type=event.event_type)
+
+        for feature in triggered_features:
+            logger.info(
+                "feature_triggered", feature=feature.name, entity_id=event.entity_id
+            )
             try:
-                # Dead Letter Queue Logic
-                dlq_stream = f"fabra:dlq:{stream}"
-                dlq_payload = fields.copy()
-                dlq_payload["error"] = str(e)
-                dlq_payload["original_stream"] = stream
+                wants_event, wants_payload = _call_convention(feature.func)
+                if wants_event and wants_payload:
+                    val = feature.func(
+                        event.entity_id, event=event, payload=event.payload
+                    )
+                elif wants_event:
+                    val = feature.func(event.entity_id, event=event)
+                elif wants_payload:
+                    val = feature.func(event.entity_id, payload=event.payload)
+                else:
+                    val = feature.func(event.entity_id)
+                updates.setdefault((feature.entity_name, event.entity_id), {})[
+                    feature.name
+                ] = val
+
+            except Exception as e:
+                logger.error(
+                    "feature_compute_failed", feature=feature.name, error=str(e)
+                )
 
-                await self.redis.xadd(dlq_stream, dlq_payload)
-                logger.warning(f"Moved message {msg_id} to DLQ {dlq_stream}")
+    async def _dead_letter(
+        self,
+        stream: str,
+        msg_id: StreamValue,
+        fields: Dict[Any, Any],
+        error: Exception,
+    ) -> bool:
+        """Copy a failed message to the stream's DLQ; returns whether it landed."""
+        try:
+            dlq_stream = f"fabra:dlq:{stream}"
+            dlq_payload = fields.copy()
+            dlq_payload["error"] = str(error)
+            dlq_payload["original_stream"] = stream
 
-                # Acknowledge original message so we don't loop forever
-                await self.ack(stream, msg_id)
-            except Exception as dlq_error:
-                logger.critical(f"Failed to move message {msg_id} to DLQ: {dlq_error}")
-            pass
+            await self.redis.xadd(dlq_stream, dlq_payload)
+            logger.warning("event_dead_lettered", msg_id=_text(msg_id), dlq=dlq_stream)
+            return True
+        except Exception as dlq_error:
+            logger.critical(
+                "event_dead_letter_failed", msg_id=_text(msg_id), error=str(dlq_error)
+            )
+            return False
+
+    async def _write_features(
+        self, entity_name: str, entity_id: str, features: Dict[str, Any]
+    ) -> None:
+        """Write one entity's computed features; failures are logged, not raised."""
+        if not self.store:
+            return
+        try:
+            await self.store.online_store.set_online_features(
+                entity_name=entity_name, entity_id=entity_id, features=features
+            )
+        except Exception as e:
+            logger.error(
+                "features_write_failed",
+                entity=entity_name,
+                entity_id=entity_id,
+                features=list(features),
+                error=str(e),
+            )
+            return
+        logger.info(
+            "features_updated", entity=entity_name, entity_id=entity_id, values=features
+        )
 
-    async def ack(self, stream: str, msg_id: str) -> None:
-        await self.redis.xack(stream, self.group_name, msg_id)
+    async def ack(self, stream: str, *msg_ids: StreamValue) -> None:
+        await self.redis.xack(stream, self.group_name, *msg_ids)
 
     async def stop(self) -> None:
         """Gracefully stop the worker."""
-        logger.info("Worker received stop signal")
+        logger.info("worker_stop_requested")
         # In a real loop, we might set a flag self.running = False
         # converting run loop to check self.running
         # For now, we rely on the task cancellation caught in run()
@@ -1,11 +1,14 @@
 from __future__ import annotations
+import asyncio
 import pytest
 import os
+import asyncpg
 from typing import AsyncGenerator, Generator, Dict, Any
 from testcontainers.redis import RedisContainer
 from testcontainers.postgres import PostgresContainer
 from redis.asyncio import Redis as AsyncRedis
 import pytest_asyncio
+from fabra.utils.tokens import TokenCounter
 
 # Ensure hermetic defaults during test *collection* (module import time).
 # Some tests instantiate stores at import time, before fixtures run.
@@ -20,15 +23,63 @@ os.environ.setdefault("FABRA_DUCKDB_PATH", ":memory:")
 # we can just setup the containers.
 
 
+class _FastPostgresContainer(PostgresContainer):
+    """
+    PostgresContainer that detects readiness with an asyncpg probe.
+
+    The stock wait execs psql inside the container on a one-second poll, so
+    a server that comes up just after a tick still costs the full interval.
+    """
+
+    def _connect(self) -> None:
+        asyncio.run(self._wait_until_accepting())
+
+    async def _wait_until_accepting(
+        self, timeout_s: float = 120.0, backoff_s: float = 0.05
+    ) -> None:
+        url = self.get_connection_url(driver=None)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        while loop.time() < deadline:
+            try:
+                conn = await asyncpg.connect(url, timeout=1)
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                asyncpg.InterfaceError,
+                asyncpg.PostgresError,
+            ):
+                await asyncio.sleep(backoff_s)
+                continue
+            await conn.close()
+            return
+        raise TimeoutError(f"Postgres at {url} not ready")
+
+
+# Fixtures backed by the session containers. Under pytest-xdist each worker
+# would otherwise boot its own Redis/Postgres pair, so tests using them are
+# pinned to one group and share a single worker (run with --dist loadgroup).
+_CONTAINER_FIXTURES = frozenset({"infrastructure", "redis_client", "postgres_url"})
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        if _CONTAINER_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.xdist_group("infrastructure"))
+
+
 @pytest.fixture(scope="session")
 def infrastructure() -> Generator[Dict[str, Any], None, None]:
     """
     Spins up the real world: Redis and Postgres.
     """
-    # 1. Spin up Containers
+    # 1. Spin up Containers, once per session. Durability is off for the
+    # throwaway database so commits don't wait on fsync.
     with (
         RedisContainer() as redis,
-        PostgresContainer("pgvector/pgvector:pg16") as postgres,
+        _FastPostgresContainer("pgvector/pgvector:pg16").with_command(
+            "-c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+        ) as postgres,
     ):
         # Get URLs
         # testcontainers-python RedisContainer might not implement get_connection_url in all versions
@@ -77,3 +128,16 @@ async def redis_client(
 def postgres_url(infrastructure: Dict[str, Any]) -> str:
     """Provide postgres_url string to tests."""
     return infrastructure["postgres_url"]
+
+
+class _LenCounter(TokenCounter):
+    """One token per character, so budgets can be read straight off the strings."""
+
+    def count(self, text: str) -> int:
+        return len(text)
+
+
+@pytest.fixture
+def len_counter() -> TokenCounter:
+    """Deterministic token counter for context budget tests."""
+    return _LenCounter()
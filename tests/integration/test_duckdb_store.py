@@ -1,8 +1,20 @@
 import pytest
 import pandas as pd
+import pyarrow as pa
+from datetime import datetime
 from fabra.core import FeatureStore
 from fabra.store.offline import DuckDBOfflineStore
 
+# Built once as Arrow so the timestamps never go through pandas inference.
+_ENTITY_TABLE = pa.table(
+    {
+        "user_id": ["u1", "u2"],
+        "timestamp": pa.array(
+            [datetime(2024, 1, 1), datetime(2024, 1, 2)], type=pa.timestamp("ns")
+        ),
+    }
+)
+
 
 @pytest.mark.asyncio
 async def test_duckdb_offline_store_basic() -> None:
@@ -10,12 +22,7 @@ async def test_duckdb_offline_store_basic() -> None:
     store = FeatureStore(offline_store=DuckDBOfflineStore())
 
     # 2. Create Entity DataFrame
-    entity_df = pd.DataFrame(
-        {
-            "user_id": ["u1", "u2"],
-            "timestamp": pd.to_datetime(["2024-01-01", "2024-01-02"]),
-        }
-    )
+    entity_df = _ENTITY_TABLE.to_pandas(types_mapper=pd.ArrowDtype)
 
     # Register dummy feature
     from fabra.core import feature, entity
@@ -34,6 +41,6 @@ async def test_duckdb_offline_store_basic() -> None:
     )
 
     # 4. Assertions
-    assert len(training_df) == 2
-    assert "user_id" in training_df.columns
+    assert training_df.shape[0] == 2
+    assert {"user_id", "timestamp"} <= set(training_df.columns)
     # Once we implement real joins, we'd assert the feature column exists too.
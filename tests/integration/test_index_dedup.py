@@ -18,12 +18,12 @@ async def test_index_dedup_logic() -> None:
         await store.add_documents("test_idx", "e1", ["content"], [[0.1]])
 
         # Verify SQL contains ON CONFLICT ... DO NOTHING
-        # execute called with (text(query), values)
-        # args[0] is the SQL text object. str(args[0])
-        assert mock_conn.execute.called
-        call_args = mock_conn.execute.call_args
-        # call_args[0][0] is the first positional arg (text object)
-        sql_text = str(call_args[0][0])
+        # Rows are COPYed into a staging table on the raw asyncpg connection,
+        # then moved with a single INSERT ... SELECT run on that connection.
+        raw_conn = await mock_conn.get_raw_connection()
+        driver = raw_conn.driver_connection
+        assert driver.copy_records_to_table.called
+        sql_text = driver.execute.call_args[0][0]
 
         assert "INSERT INTO fabra_index_test_idx" in sql_text
         assert "ON CONFLICT (entity_id, content_hash) DO NOTHING" in sql_text
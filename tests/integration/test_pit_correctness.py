@@ -64,71 +64,52 @@ async def test_pit_correctness_duckdb() -> None:
 
 
 @pytest.mark.asyncio
-async def test_pit_correctness_postgres() -> None:
+async def test_pit_correctness_postgres(postgres_url: str) -> None:
     from fabra.store.postgres import PostgresOfflineStore
-    from testcontainers.postgres import PostgresContainer
     from sqlalchemy import text
 
-    try:
-        postgres = PostgresContainer("postgres:15")
-        postgres.start()
-        connection_url = postgres.get_connection_url()
-    except Exception:
-        pytest.skip("Docker not available or failed to start Postgres container")
-
-    try:
-        # 1. Setup Store
-        if "postgresql+psycopg2://" in connection_url:
-            async_connection_url = connection_url.replace(
-                "postgresql+psycopg2://", "postgresql+asyncpg://"
-            )
-        else:
-            async_connection_url = connection_url.replace(
-                "postgresql://", "postgresql+asyncpg://"
-            )
-        offline_store = PostgresOfflineStore(connection_string=async_connection_url)
-
-        # Create feature table with history
-        async with offline_store.engine.begin() as conn:  # type: ignore[no-untyped-call]
-            await conn.execute(
-                text(
-                    "CREATE TABLE txn_count (entity_id VARCHAR, timestamp TIMESTAMP, txn_count INTEGER)"
-                )
-            )
-            await conn.execute(
-                text("INSERT INTO txn_count VALUES ('u1', '2024-01-01 10:00:00', 10)")
-            )
-            await conn.execute(
-                text("INSERT INTO txn_count VALUES ('u1', '2024-01-01 12:00:00', 20)")
-            )
+    # 1. Setup Store on the shared session container
+    offline_store = PostgresOfflineStore(connection_string=postgres_url)
 
-        store = FeatureStore(
-            offline_store=offline_store, online_store=InMemoryOnlineStore()
+    # Create feature table with history
+    async with offline_store.engine.begin() as conn:  # type: ignore[no-untyped-call]
+        await conn.execute(text("DROP TABLE IF EXISTS txn_count"))
+        await conn.execute(
+            text(
+                "CREATE TABLE txn_count (entity_id VARCHAR, timestamp TIMESTAMP, txn_count INTEGER)"
+            )
+        )
+        await conn.execute(
+            text("INSERT INTO txn_count VALUES ('u1', '2024-01-01 10:00:00', 10)")
+        )
+        await conn.execute(
+            text("INSERT INTO txn_count VALUES ('u1', '2024-01-01 12:00:00', 20)")
         )
 
-        @entity(store)
-        class User:
-            user_id: str
+    store = FeatureStore(
+        offline_store=offline_store, online_store=InMemoryOnlineStore()
+    )
 
-        @feature(entity=User, sql="SELECT * FROM txn_count")
-        def txn_count(user_id: str) -> int:
-            return 0
+    @entity(store)
+    class User:
+        user_id: str
 
-        # 2. Query at T2 (2024-01-01 11:00) -> Should get 10
-        entity_df_t2 = pd.DataFrame(
-            {"user_id": ["u1"], "timestamp": pd.to_datetime(["2024-01-01 11:00:00"])}
-        )
+    @feature(entity=User, sql="SELECT * FROM txn_count")
+    def txn_count(user_id: str) -> int:
+        return 0
 
-        training_df_t2 = await store.get_training_data(entity_df_t2, ["txn_count"])
-        assert training_df_t2.iloc[0]["txn_count"] == 10
+    # 2. Query at T2 (2024-01-01 11:00) -> Should get 10
+    entity_df_t2 = pd.DataFrame(
+        {"user_id": ["u1"], "timestamp": pd.to_datetime(["2024-01-01 11:00:00"])}
+    )
 
-        # 3. Query at T4 (2024-01-01 13:00) -> Should get 20
-        entity_df_t4 = pd.DataFrame(
-            {"user_id": ["u1"], "timestamp": pd.to_datetime(["2024-01-01 13:00:00"])}
-        )
+    training_df_t2 = await store.get_training_data(entity_df_t2, ["txn_count"])
+    assert training_df_t2.iloc[0]["txn_count"] == 10
 
-        training_df_t4 = await store.get_training_data(entity_df_t4, ["txn_count"])
-        assert training_df_t4.iloc[0]["txn_count"] == 20
+    # 3. Query at T4 (2024-01-01 13:00) -> Should get 20
+    entity_df_t4 = pd.DataFrame(
+        {"user_id": ["u1"], "timestamp": pd.to_datetime(["2024-01-01 13:00:00"])}
+    )
 
-    finally:
-        postgres.stop()
+    training_df_t4 = await store.get_training_data(entity_df_t4, ["txn_count"])
+    assert training_df_t4.iloc[0]["txn_count"] == 20
@@ -1,10 +1,19 @@
 import pytest
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 from fabra.store.postgres import PostgresOfflineStore
 from sqlalchemy import text
 from typing import Dict, Any
 
+# Built once as Arrow so the timestamps never go through pandas inference.
+_ENTITY_TABLE = pa.table(
+    {
+        "entity_id": ["1", "2"],
+        "timestamp": pa.array([datetime(2024, 1, 1)] * 2, type=pa.timestamp("ns")),
+    }
+)
+
 
 # Use shared infrastructure fixture
 @pytest.mark.integration
@@ -30,21 +39,14 @@ async def test_postgres_offline_store_basic(infrastructure: Dict[str, Any]) -> N
         )
 
     # 2. Test Retrieval
-    entity_df = pd.DataFrame(
-        {
-            "entity_id": ["1", "2"],
-            "timestamp": [pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-01")],
-        }
-    )
+    entity_df = _ENTITY_TABLE.to_pandas(types_mapper=pd.ArrowDtype)
 
     features_df = await store.get_training_data(
         entity_df, ["features"], "entity_id", "timestamp"
     )
 
-    assert len(features_df) == 2
-    assert "features" in features_df.columns
-    assert features_df.iloc[0]["features"] == 100
-    assert features_df.iloc[1]["features"] == 200
+    assert features_df.shape == (2, 3)
+    assert features_df["features"].tolist() == [100, 200]
 
 
 @pytest.mark.integration
@@ -317,7 +317,7 @@ async def test_worker_init_variations():
     # 3. Redis URL in init
     with patch("fabra.worker.Redis.from_url") as mock_from_url:
         w3 = AxiomWorker(redis_url="redis://localhost")
-        mock_from_url.assert_called_with("redis://localhost", decode_responses=True)
+        mock_from_url.assert_called_with("redis://localhost")
         assert w3.redis == mock_from_url.return_value
 
     # 4. Fallback to config (no store, no url provided)
@@ -119,8 +119,8 @@ def test_convert_to_record_response():
 
 @pytest.mark.asyncio
 async def test_get_store_info():
-    """Test get_store_info API logic."""
-    from fabra.ui_server import get_store_info, _state
+    """Test the StoreInfo built for GET /api/store."""
+    from fabra.ui_server import _current_store_info, _state
 
     # Setup mock state
     mock_store = MagicMock()
@@ -155,7 +155,7 @@ async def test_get_store_info():
     }
 
     with patch.dict(_state, new_state, clear=True):
-        info = await get_store_info(None)
+        info = _current_store_info()[0]
 
         assert info.file_name == "features.py"
         assert len(info.entities) == 1
@@ -211,7 +211,7 @@ async def test_assemble_context():
 @pytest.mark.asyncio
 async def test_mermaid_graph():
     """Test mermaid graph generation."""
-    from fabra.ui_server import get_mermaid_graph, _state
+    from fabra.ui_server import _graph_code, _state
 
     mock_store = MagicMock()
     mock_store.online_store.__class__.__name__ = "RedisOnlineStore"
@@ -225,8 +225,7 @@ async def test_mermaid_graph():
     state = {"store": mock_store}
 
     with patch.dict(_state, state, clear=True):
-        graph = await get_mermaid_graph(None)
-        code = graph.code
+        code = _graph_code()
 
         assert "graph LR" in code
         assert "RedisOnlineStore" in code
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import orjson
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from datetime import timedelta, datetime, timezone
 from fabra.context import context, Context, ContextItem
+from fabra.utils.tokens import TokenCounter
 
 
 @pytest.mark.asyncio
@@ -76,22 +78,19 @@ async def test_context_caching() -> None:
     # We should await mock_store.set? No, the code awaits it.
 
     # 2. Setup Cache Hit
-    # The stored value is the JSON dump of the context
-    mock_store.get.return_value = res1.model_dump_json()
+    # The stored value is the raw JSON bytes Redis hands back
+    mock_store.get.return_value = orjson.dumps(res1.model_dump(mode="json"))
 
     # 3. Second Call (Hit)
     res2 = await expensive_assembly(arg="test")
-    assert res2.content == "Processed test"
-    assert res2.id == res1.id  # Should be identical object ID from cache
+    assert res2.meta.pop("is_cached_response") is True
+    assert res2.model_dump(mode="json") == res1.model_dump(mode="json")
 
 
 @pytest.mark.asyncio
-async def test_context_budgeting_trimming() -> None:
+async def test_context_budgeting_trimming(len_counter: TokenCounter) -> None:
     # 1. Define items
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
-    @context(name="budget_ctx_mocked", max_tokens=10, token_counter=mock_counter)
+    @context(name="budget_ctx_mocked", max_tokens=10, token_counter=len_counter)
     async def assemble_items_mocked() -> list[ContextItem]:
         return [
             ContextItem(content="KeepMe", required=True),  # 6 tokens
@@ -107,11 +106,8 @@ async def test_context_budgeting_trimming() -> None:
 
 
 @pytest.mark.asyncio
-async def test_context_budget_graceful_degradation() -> None:
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
-    @context(name="fail_ctx", max_tokens=5, token_counter=mock_counter)
+async def test_context_budget_graceful_degradation(len_counter: TokenCounter) -> None:
+    @context(name="fail_ctx", max_tokens=5, token_counter=len_counter)
     async def assemble_fail() -> list[ContextItem]:
         return [
             ContextItem(content="TooLongForBudget", required=True)  # 16 tokens
@@ -148,7 +144,7 @@ async def test_context_freshness_sla() -> None:
         version="v1",
     )
 
-    mock_store.get.return_value = old_ctx.model_dump_json()
+    mock_store.get.return_value = orjson.dumps(old_ctx.model_dump(mode="json"))
 
     # Define context with 1 hour acceptable staleness
     # Since existing item is 2 hours old, it should be stale -> recompute
@@ -183,18 +179,14 @@ async def test_context_freshness_sla() -> None:
     # Executing
     result_lax = await get_lax_data()
     # Should get "Old Content" because 2 hours old < 3 hours max staleness
-    assert result_lax.content == "Old Content"
-    assert result_lax.content == "Old Content"
-    assert result_lax.id == "old"
+    assert result_lax.meta.pop("is_cached_response") is True
+    assert result_lax.model_dump(mode="json") == old_ctx.model_dump(mode="json")
 
 
 @pytest.mark.asyncio
-async def test_context_budget_priority() -> None:
+async def test_context_budget_priority(len_counter: TokenCounter) -> None:
     # Setup counter: length of content
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
-    @context(name="priority_ctx", max_tokens=25, token_counter=mock_counter)
+    @context(name="priority_ctx", max_tokens=25, token_counter=len_counter)
     async def assemble_priority() -> list[ContextItem]:
         return [
             # High Priority (should be kept last if dropping required)
@@ -230,12 +222,9 @@ async def test_context_budget_priority() -> None:
 
 
 @pytest.mark.asyncio
-async def test_context_budget_priority_execution() -> None:
+async def test_context_budget_priority_execution(len_counter: TokenCounter) -> None:
     # Separate test to execute with correct params
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
-    @context(name="priority_ctx_exec", max_tokens=15, token_counter=mock_counter)
+    @context(name="priority_ctx_exec", max_tokens=15, token_counter=len_counter)
     async def assemble_priority_exec() -> list[ContextItem]:
         return [
             # Lower numbers = higher priority (kept). Higher numbers dropped first.
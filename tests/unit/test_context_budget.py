@@ -51,3 +51,29 @@ async def test_context_budget_drop_optional() -> None:
     assert "456" in res.content
     assert "123" not in res.content
     assert res.meta["dropped_items"] == 1
+
+
+@pytest.mark.asyncio
+async def test_context_budget_counts_candidates_in_one_batch() -> None:
+    class BatchRecordingCounter(MockCounter):
+        def __init__(self) -> None:
+            self.batches: list[list[str]] = []
+
+        def count_batch(self, texts: list[str]) -> list[int]:
+            self.batches.append(texts)
+            return super().count_batch(texts)
+
+    counter = BatchRecordingCounter()
+
+    @context(max_tokens=5, token_counter=counter)
+    async def batch_ctx() -> list[ContextItem]:
+        return [
+            ContextItem(content="12", required=False, priority=1),
+            ContextItem(content="34", required=False, priority=2),
+            ContextItem(content="567", required=True),
+        ]
+
+    res = await batch_ctx()
+    # Lowest priority (highest number) goes first; one drop is enough
+    assert res.content == "12\n567"
+    assert counter.batches == [["34", "12"]]
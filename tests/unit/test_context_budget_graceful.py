@@ -1,16 +1,13 @@
 import pytest
-from unittest.mock import MagicMock
 from fabra.context import context, ContextItem
+from fabra.utils.tokens import TokenCounter
 
 
 @pytest.mark.asyncio
-async def test_context_budget_graceful() -> None:
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
+async def test_context_budget_graceful(len_counter: TokenCounter) -> None:
     # Define context that will overflow budget with required items
     # Budget 5. "Required" is 8 chars.
-    @context(name="overflow_ctx", max_tokens=5, token_counter=mock_counter)
+    @context(name="overflow_ctx", max_tokens=5, token_counter=len_counter)
     async def overflow_func() -> list[ContextItem]:
         return [
             ContextItem(content="Required", required=True)  # 8 chars > 5
@@ -25,11 +22,8 @@ async def test_context_budget_graceful() -> None:
 
 
 @pytest.mark.asyncio
-async def test_context_budget_graceful_string() -> None:
-    mock_counter = MagicMock()
-    mock_counter.count.side_effect = lambda x: len(x)
-
-    @context(name="overflow_str", max_tokens=5, token_counter=mock_counter)
+async def test_context_budget_graceful_string(len_counter: TokenCounter) -> None:
+    @context(name="overflow_str", max_tokens=5, token_counter=len_counter)
     async def overflow_str_func() -> str:
         return "TooLong"  # 7 chars > 5
 
@@ -27,6 +27,38 @@ async def test_in_memory_online_store_basic() -> None:
     assert "missing_feature" not in result
 
 
+@pytest.mark.asyncio
+async def test_in_memory_online_store_miss() -> None:
+    store = InMemoryOnlineStore()
+    await store.set_online_features("User", "u1", {"f1": 1})
+
+    assert await store.get_online_features("Unknown", "u1", ["f1"]) == {}
+    assert await store.get_online_features("User", "u2", ["f1"]) == {}
+    assert await store.get_online_features_with_meta("User", "u2", ["f1"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_online_store_batch() -> None:
+    store = InMemoryOnlineStore()
+    await store.set_online_features_batch("User", {"u1": {"f1": 1}, "u2": {"f1": 2}})
+
+    result = await store.get_online_features_batch("User", ["u2", "u3", "u1"], ["f1"])
+
+    assert result == [{"f1": 2}, {}, {"f1": 1}]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_online_store_batch_merges_features() -> None:
+    store = InMemoryOnlineStore()
+    await store.set_online_features("User", "u1", {"f1": 1})
+    await store.set_online_features_batch("User", {"u1": {"f2": 2}})
+
+    assert await store.get_online_features("User", "u1", ["f1", "f2"]) == {
+        "f1": 1,
+        "f2": 2,
+    }
+
+
 @pytest.mark.asyncio
 async def test_in_memory_online_store_bulk() -> None:
     store = InMemoryOnlineStore()
@@ -80,6 +112,17 @@ async def test_cache_primitives() -> None:
     assert "m2" in members
 
 
+@pytest.mark.asyncio
+async def test_cache_obj_primitives() -> None:
+    store = InMemoryOnlineStore()
+
+    await store.cache_set_obj("obj1", {"a": [1, 2], "b": "x"})
+    assert await store.cache_get_obj("obj1") == {"a": [1, 2], "b": "x"}
+    # Stored as bytes, so the raw primitive still works
+    assert isinstance(await store.get("obj1"), bytes)
+    assert await store.cache_get_obj("missing") is None
+
+
 @pytest.mark.asyncio
 async def test_pipeline_methods() -> None:
     store = InMemoryOnlineStore()
@@ -72,6 +72,58 @@ def test_audit_middleware(mock_store: MagicMock) -> None:
         assert not audit_call_get
 
 
+def test_metrics_middleware_records_response_status(mock_store: MagicMock) -> None:
+    from fabra.server import REQUEST_COUNT
+
+    app = create_app(mock_store)
+    client = TestClient(app)
+
+    metric = REQUEST_COUNT.labels(method="GET", endpoint="/v1/missing", status=404)
+    before = metric._value.get()
+
+    res = client.get("/v1/missing")
+    assert res.status_code == 404
+
+    assert metric._value.get() == before + 1
+
+
+def test_metrics_middleware_counts_unhandled_exception_as_500(
+    mock_store: MagicMock,
+) -> None:
+    from fabra.server import REQUEST_COUNT
+
+    app = create_app(mock_store)
+
+    @app.get("/boom")
+    async def boom() -> None:
+        raise RuntimeError("boom")
+
+    client = TestClient(app, raise_server_exceptions=False)
+
+    metric = REQUEST_COUNT.labels(method="GET", endpoint="/boom", status=500)
+    before = metric._value.get()
+
+    res = client.get("/boom")
+    assert res.status_code == 500
+
+    assert metric._value.get() == before + 1
+
+
+def test_metrics_middleware_skips_probe_paths(mock_store: MagicMock) -> None:
+    from fabra.server import REQUEST_COUNT
+
+    app = create_app(mock_store)
+    client = TestClient(app)
+
+    metric = REQUEST_COUNT.labels(method="GET", endpoint="/health", status=200)
+    before = metric._value.get()
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/metrics").status_code == 200
+
+    assert metric._value.get() == before
+
+
 @pytest.mark.asyncio
 async def test_cache_invalidation(mock_store: MagicMock) -> None:
     app = create_app(mock_store)
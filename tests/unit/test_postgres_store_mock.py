@@ -1,7 +1,9 @@
 import pytest
+import json
 from unittest.mock import AsyncMock, MagicMock, patch
 from fabra.store.postgres import PostgresOfflineStore
 import pandas as pd
+import pyarrow as pa
 from datetime import datetime
 from typing import Any
 
@@ -26,65 +28,249 @@ def mock_engine_setup() -> Any:
         yield mock_conn
 
 
+def test_pg_engine_disables_jit() -> None:
+    with patch(PATCH_PATH) as MockEngine:
+        PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    connect_args = MockEngine.call_args.kwargs["connect_args"]
+    assert connect_args == {"server_settings": {"jit": "off"}}
+
+
+@pytest.mark.asyncio
+async def test_pg_warmup_fills_pool(mock_engine_setup: Any) -> None:
+    with patch.dict("os.environ", {"FABRA_PG_POOL_SIZE": "3"}):
+        store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    mock_engine_setup.start.return_value = mock_engine_setup
+    await store.warmup()
+
+    # All connections are held at once, then returned to the pool
+    assert mock_engine_setup.start.await_count == 3
+    assert mock_engine_setup.close.await_count == 3
+
+
 @pytest.mark.asyncio
 async def test_pg_get_training_data(mock_engine_setup: Any) -> None:
     store = PostgresOfflineStore("postgresql+asyncpg://mock")
 
-    df = pd.DataFrame({"id": ["1"], "ts": [datetime.now()]})
+    df = pd.DataFrame({"id": [1], "ts": [datetime.now()]})
 
-    # Mock execute result
-    mock_result = MagicMock()
-    mock_result.fetchall.return_value = []
-    mock_result.keys.return_value = ["entity_id", "timestamp", "f1"]
-
-    mock_engine_setup.execute.return_value = mock_result
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    driver = raw_conn.driver_connection
+    driver.fetch.return_value = []
 
     res = await store.get_training_data(df, ["f1"], "id", "ts")
 
     assert isinstance(res, pd.DataFrame)
-    mock_engine_setup.execute.assert_called()
+    assert "f1" in res.columns
+
+    # Entity keys are bound as naive-UTC arrays, not uploaded to a temp table
+    sql, entity_ids, timestamps = driver.fetch.call_args.args
+    assert "unnest($1::text[], $2::timestamp[])" in sql
+    assert entity_ids == ["1"]
+    assert timestamps == [df["ts"].iloc[0].to_pydatetime()]
+    assert timestamps[0].tzinfo is None
+    mock_engine_setup.execute.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_pg_search_vectors(mock_engine_setup: Any) -> None:
+async def test_pg_get_training_data_joins_on_keys(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    t1 = datetime(2024, 1, 1, 10)
+    t2 = datetime(2024, 1, 1, 11)
+    df = pd.DataFrame(
+        {"id": ["u2", "u1", "u2"], "ts": [t2, t1, t2], "f1": ["a", "b", "c"]}
+    )
+
+    # SQL returns one row per distinct key, in its own order
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.driver_connection.fetch.return_value = [("u1", t1, 10), ("u2", t2, 20)]
+
+    res = await store.get_training_data(df, ["f1"], "id", "ts")
+
+    # Entity rows keep their order and count; clashing columns get _sql
+    assert res["id"].tolist() == ["u2", "u1", "u2"]
+    assert res["id"].dtype == "string[pyarrow]"
+    assert res["f1"].tolist() == ["a", "b", "c"]
+    assert res["f1_sql"].tolist() == [20, 10, 20]
+
+
+@pytest.mark.asyncio
+async def test_pg_get_training_data_arrow_backed_entity_df(
+    mock_engine_setup: Any,
+) -> None:
     store = PostgresOfflineStore("postgresql+asyncpg://mock")
 
-    mock_result = MagicMock()
-    Row = MagicMock()
-    Row.content = "txt"
-    Row.metadata = {}
-    Row.score = 0.9
-    mock_result.fetchall.return_value = [Row]
+    t1 = datetime(2024, 1, 1, 10)
+    df = pa.table(
+        {"id": ["u1", "u2"], "ts": pa.array([t1, t1], type=pa.timestamp("ns"))}
+    ).to_pandas(types_mapper=pd.ArrowDtype)
+
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.driver_connection.fetch.return_value = [("u1", t1, 10), ("u2", t1, 20)]
+
+    res = await store.get_training_data(df, ["f1"], "id", "ts")
+
+    assert res["ts"].dtype == "datetime64[ns]"
+    assert res["f1"].tolist() == [10, 20]
+
 
-    mock_engine_setup.execute.return_value = mock_result
+@pytest.mark.asyncio
+async def test_pg_get_training_data_point_in_time_query(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    df = pd.DataFrame({"id": ["1"], "ts": [datetime.now()]})
+
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.driver_connection.fetch.return_value = []
+
+    await store.get_training_data(df, ["f1"], "id", "ts")
+
+    query = raw_conn.driver_connection.fetch.call_args.args[0]
+    assert query.startswith("SELECT DISTINCT ON (e.entity_id, e.timestamp)")
+    assert "JOIN f1 f ON f.entity_id = e.entity_id" in query
+    assert "ORDER BY e.entity_id, e.timestamp, f.timestamp DESC" in query
+    assert "LATERAL" not in query
+
+
+@pytest.mark.asyncio
+async def test_pg_get_training_data_gathers_features(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
 
-    res = await store.search("idx", [0.1], top_k=1)
+    ts = datetime(2024, 1, 1, 12, 30)
+    df = pd.DataFrame({"id": ["u1", "u2"], "ts": [ts, ts]})
+
+    async def fetch(sql: str, *args: Any) -> list[tuple[Any, ...]]:
+        if "JOIN f1 f" in sql:
+            return [("u1", ts, 1), ("u2", ts, 2)]
+        return [("u2", ts, "b")]
+
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.driver_connection.fetch.side_effect = fetch
+
+    res = await store.get_training_data(df, ["f1", "f2"], "id", "ts")
+
+    # One query per feature, each on its own pooled connection
+    assert raw_conn.driver_connection.fetch.await_count == 2
+    assert mock_engine_setup.__aenter__.await_count == 2
+    assert res["f1"].tolist() == [1, 2]
+    assert res["f2"].isna().tolist() == [True, False]
+    assert res["f2"].iloc[1] == "b"
+
+
+@pytest.mark.asyncio
+async def test_pg_get_training_data_rejects_bad_feature(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    df = pd.DataFrame({"id": ["1"], "ts": [datetime.now()]})
+
+    with pytest.raises(ValueError, match="Invalid feature name"):
+        await store.get_training_data(df, ["f1; DROP TABLE x"], "id", "ts")
+
+
+@pytest.mark.asyncio
+async def test_pg_ensure_feature_indexes(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+    mock_engine_setup.execution_options.return_value = mock_engine_setup
+
+    await store.ensure_feature_indexes("f1")
+
+    mock_engine_setup.execution_options.assert_awaited_once_with(
+        isolation_level="AUTOCOMMIT"
+    )
+    sql = str(mock_engine_setup.execute.call_args.args[0])
+    assert sql == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_f1_eid_ts"
+        " ON f1 (entity_id, timestamp DESC) INCLUDE (f1)"
+    )
+
+    with pytest.raises(ValueError, match="Invalid feature name"):
+        await store.ensure_feature_indexes("f1", column="v; DROP TABLE f1")
+
+
+@pytest.mark.asyncio
+async def test_pg_search_vectors(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.info = {}
+    driver = raw_conn.driver_connection
+    driver.fetch.return_value = [{"content": "txt", "metadata": {}, "score": 0.9}]
+
+    with patch("fabra.store.postgres.register_vector") as mock_register:
+        res = await store.search("idx", [0.1], top_k=1)
+        await store.search("idx", [0.2], top_k=1)
 
     assert len(res) == 1
     assert res[0]["content"] == "txt"
 
+    # The vector is bound as a list for the binary codec, which is registered
+    # once per pooled connection
+    mock_register.assert_awaited_once_with(driver)
+    assert driver.fetch.call_args.args[1:] == ([0.2], 1)
+    mock_engine_setup.execute.assert_not_called()
+
 
 @pytest.mark.asyncio
 async def test_pg_add_documents(mock_engine_setup: Any) -> None:
     store = PostgresOfflineStore("postgresql+asyncpg://mock")
 
-    await store.add_documents("idx", "doc1", ["c"], [[0.1]])
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    raw_conn.info = {}
+
+    meta = {"source": "docs"}
+    await store.add_documents("idx", "doc1", ["c"], [[0.1]], metadatas=[meta])
+
+    copy_call = raw_conn.driver_connection.copy_records_to_table.call_args
+    assert copy_call.args[0] == "fabra_index_stage"
+    record = copy_call.kwargs["records"][0]
+    assert record[0] == "doc1"
+    # Embeddings are staged as float lists (binary float4[]), not text
+    assert record[4] == [0.1]
+    # Metadata is staged as orjson bytes with the mandatory keys added, and
+    # the caller's dict is left untouched
+    staged_meta = json.loads(record[5])
+    assert staged_meta["source"] == "docs"
+    assert staged_meta["content_hash"] == record[3]
+    assert meta == {"source": "docs"}
+
+    sql = raw_conn.driver_connection.execute.call_args.args[0]
+    assert "INSERT INTO fabra_index_idx" in sql
+    assert "FROM fabra_index_stage" in sql
+
+    # The staging table is created once per connection, not per call
+    await store.add_documents("idx", "doc2", ["d"], [[0.2]])
+    statements = [c.args[0] for c in raw_conn.driver_connection.execute.call_args_list]
+    assert sum("CREATE TEMP TABLE" in s for s in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_pg_create_index_table_fp16(mock_engine_setup: Any) -> None:
+    store = PostgresOfflineStore("postgresql+asyncpg://mock")
+
+    await store.create_index_table("idx", dimension=8, precision="fp16")
 
-    mock_engine_setup.execute.assert_called()
+    statements = [str(c.args[0]) for c in mock_engine_setup.execute.call_args_list]
+    assert any("embedding halfvec(8)" in s for s in statements)
+    assert any("halfvec_cosine_ops" in s for s in statements)
+
+    with pytest.raises(ValueError, match="precision"):
+        await store.create_index_table("idx", precision="int4")
 
 
 @pytest.mark.asyncio
 async def test_pg_time_travel(mock_engine_setup: Any) -> None:
     store = PostgresOfflineStore("postgresql+asyncpg://mock")
 
-    mock_result = MagicMock()
-    mock_row = MagicMock()
-    # Mock row mapping for dict conversion
-    mock_row._mapping = {"f1": 123}
-    mock_result.fetchone.return_value = mock_row
-
-    mock_engine_setup.execute.return_value = mock_result
+    raw_conn = await mock_engine_setup.get_raw_connection()
+    driver = raw_conn.driver_connection
+    driver.fetchrow.return_value = {"f1": 123}
 
-    res = await store.get_historical_features("Ent", "e1", ["f1"], datetime.now())
+    ts = datetime.now()
+    res = await store.get_historical_features("Ent", "e1", ["f1"], ts)
 
     assert res["f1"] == 123
+    sql, *args = driver.fetchrow.call_args.args
+    assert "LEFT JOIN LATERAL" in sql
+    assert args == ["e1", ts]
@@ -1,5 +1,6 @@
 import pytest
 import json
+import numpy as np
 from unittest.mock import AsyncMock, MagicMock, patch
 from fabra.store.redis import RedisOnlineStore
 import pandas as pd
@@ -29,6 +30,7 @@ def mock_redis() -> Any:
         pipeline.execute = AsyncMock()
 
         instance.pipeline.return_value = pipeline
+        instance.register_script.return_value = AsyncMock()
 
         # Configure factory methods to return this instance
         MockRedis.from_url.return_value = instance
@@ -58,14 +60,65 @@ async def test_redis_get_online_features(mock_redis: Any) -> None:
     assert res["f2"] == 20.5
 
 
+@pytest.mark.asyncio
+async def test_redis_get_online_features_batch(mock_redis: Any) -> None:
+    pipeline = mock_redis.pipeline.return_value
+    pipeline.hmget = MagicMock()
+    pipeline.execute.return_value = [[json.dumps(1), None], [None, "raw"]]
+
+    store = RedisOnlineStore("redis://mock")
+
+    res = await store.get_online_features_batch("User", ["u1", "u2"], ["f1", "f2"])
+
+    # One pipelined round-trip, no per-entity HMGET on the client
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    assert pipeline.hmget.call_count == 2
+    pipeline.hmget.assert_any_call("User:u2", ["f1", "f2"])
+    pipeline.execute.assert_awaited_once()
+    mock_redis.hmget.assert_not_called()
+    assert res == [{"f1": 1}, {"f2": "raw"}]
+
+
 @pytest.mark.asyncio
 async def test_redis_set_online_features(mock_redis: Any) -> None:
     store = RedisOnlineStore("redis://mock")
 
     await store.set_online_features("User", "u1", {"f1": 10}, ttl=60)
 
-    mock_redis.hset.assert_called()
-    mock_redis.expire.assert_called()
+    # With a TTL, HSET and EXPIRE run as one script call
+    script = mock_redis.register_script.return_value
+    script.assert_awaited_once()
+    assert script.call_args.kwargs["keys"] == ["User:u1"]
+    ttl, field, _ = script.call_args.kwargs["args"]
+    assert (ttl, field) == (60, "f1")
+    mock_redis.hset.assert_not_called()
+    mock_redis.expire.assert_not_called()
+
+    await store.set_online_features("User", "u1", {"f1": 10})
+    mock_redis.hset.assert_called_once()
+
+    # Values are written as orjson bytes and read back through the same path
+    payload = mock_redis.hset.call_args.kwargs["mapping"]["f1"]
+    assert isinstance(payload, bytes)
+    mock_redis.hmget.return_value = [payload]
+    assert await store.get_online_features("User", "u1", ["f1"]) == {"f1": 10}
+
+
+@pytest.mark.asyncio
+async def test_redis_set_online_features_numpy_values(mock_redis: Any) -> None:
+    store = RedisOnlineStore("redis://mock")
+
+    await store.set_online_features(
+        "User",
+        "u1",
+        {"f1": np.float64(1.5), "f2": np.int64(3), "f3": np.float64("nan")},
+    )
+
+    mapping = mock_redis.hset.call_args.kwargs["mapping"]
+    mock_redis.hmget.return_value = [mapping["f1"], mapping["f2"], mapping["f3"]]
+    result = await store.get_online_features("User", "u1", ["f1", "f2", "f3"])
+    # NaN has no JSON form and comes back as None
+    assert result == {"f1": 1.5, "f2": 3, "f3": None}
 
 
 @pytest.mark.asyncio
@@ -80,6 +133,32 @@ async def test_redis_bulk(mock_redis: Any) -> None:
     pipeline.execute.assert_called()
 
 
+@pytest.mark.asyncio
+async def test_redis_bulk_uses_pipeline_per_batch(mock_redis: Any) -> None:
+    store = RedisOnlineStore("redis://mock")
+    df = pd.DataFrame({"id": [f"u{i}" for i in range(2500)], "f1": range(2500)})
+
+    await store.set_online_features_bulk("User", df, "f1", "id", ttl=60)
+
+    # 2500 rows -> three batches, each on its own pipeline
+    assert mock_redis.pipeline.call_count == 3
+    mock_redis.pipeline.assert_called_with(transaction=False)
+    pipeline = mock_redis.pipeline.return_value
+    assert pipeline.execute.await_count == 3
+
+    # TTL writes queue one script call per row on the batch pipeline
+    script = mock_redis.register_script.return_value
+    assert script.await_count == 2500
+    pipeline.hset.assert_not_called()
+    pipeline.expire.assert_not_called()
+    call = script.call_args.kwargs
+    assert call["keys"] == ["User:u2499"]
+    assert call["client"] is pipeline
+    ttl, field, payload = call["args"]
+    assert (ttl, field) == (60, "f1")
+    assert json.loads(payload)["value"] == 2499
+
+
 @pytest.mark.asyncio
 async def test_redis_primitives(mock_redis: Any) -> None:
     store = RedisOnlineStore("redis://mock")
@@ -89,3 +168,14 @@ async def test_redis_primitives(mock_redis: Any) -> None:
 
     await store.set("k", "v")
     mock_redis.set.assert_called()
+
+
+def test_redis_sync_client_is_cached() -> None:
+    with patch("redis.ConnectionPool") as MockPool, patch("redis.Redis") as MockRedis:
+        store = RedisOnlineStore(host="localhost", port=6379)
+        first = store.get_sync_client()
+        second = store.get_sync_client()
+
+    assert first is second
+    MockPool.assert_called_once()
+    MockRedis.assert_called_once_with(connection_pool=MockPool.return_value)
@@ -1,14 +1,27 @@
 import pytest
+from typing import Tuple
+from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport
 from fabra.server import create_app
 from fabra.core import FeatureStore, entity, feature
 from fabra.store.online import InMemoryOnlineStore
 
 
+@pytest.fixture(scope="module")
+def served_store() -> Tuple[FeatureStore, FastAPI]:
+    """One store and app for the module; tests seed the shared store."""
+    store = FeatureStore(online_store=InMemoryOnlineStore())
+    return store, create_app(store)
+
+
+def _client(app: FastAPI) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
 @pytest.mark.asyncio
-async def test_api_get_features() -> None:
+async def test_api_get_features(served_store: Tuple[FeatureStore, FastAPI]) -> None:
     # 1. Setup Store
-    store = FeatureStore(online_store=InMemoryOnlineStore())
+    store, app = served_store
 
     @entity(store)
     class User:
@@ -23,10 +36,8 @@ async def test_api_get_features() -> None:
         entity_name="User", entity_id="u1", features={"user_clicks": 42}
     )
 
-    # 2. Create App & Client
-    app = create_app(store)
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
+    # 2. Create Client
+    async with _client(app) as client:
         # 3. Request Features
         response = await client.post(
             "/v1/features",
@@ -44,20 +55,20 @@ async def test_api_get_features() -> None:
 
 
 @pytest.mark.asyncio
-async def test_api_health() -> None:
-    store = FeatureStore()
-    app = create_app(store)
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
+async def test_api_health(served_store: Tuple[FeatureStore, FastAPI]) -> None:
+    _store, app = served_store
+    async with _client(app) as client:
         response = await client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
 
 
 @pytest.mark.asyncio
-async def test_api_visualize_context() -> None:
+async def test_api_visualize_context(
+    served_store: Tuple[FeatureStore, FastAPI],
+) -> None:
     # 1. Setup Store with trace data
-    store = FeatureStore(online_store=InMemoryOnlineStore())
+    store, app = served_store
 
     # Manually seed a trace
     from fabra.models import ContextTrace
@@ -79,10 +90,8 @@ async def test_api_visualize_context() -> None:
     # InMemoryOnlineStore.set takes bytes? Let's check impl. Core.py sets bytes.
     await store.online_store.set("trace:test_ctx_123", trace.model_dump_json().encode())
 
-    # 2. Create App & Client
-    app = create_app(store)
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
+    # 2. Create Client
+    async with _client(app) as client:
         # 3. Request Visualization
         response = await client.get("/v1/context/test_ctx_123/visualize")
 
@@ -35,6 +35,30 @@ def test_v1_features_batch(client: TestClient) -> None:
     assert data["u1"]["age"] == 30
 
 
+def test_v1_features_batch_reports_per_entity_error() -> None:
+    store = MagicMock(spec=FeatureStore)
+    store.online_store = MagicMock()
+
+    async def get_online_features(
+        entity_name: str, entity_id: str, features: list
+    ) -> dict:
+        if entity_id == "bad":
+            raise ValueError("lookup failed")
+        return {"age": 30}
+
+    store.get_online_features = AsyncMock(side_effect=get_online_features)
+    client = TestClient(create_app(store))
+
+    payload = {"name": "User", "ids": ["u1", "bad", "u2"], "features": ["age"]}
+    response = client.post("/v1/features/batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["u1"] == {"age": 30}
+    assert data["u2"] == {"age": 30}
+    assert data["bad"] == {"error": "lookup failed"}
+
+
 def test_v1_features_single(client: TestClient) -> None:
     payload = {"entity_name": "User", "entity_id": "u1", "features": ["age"]}
     response = client.post("/v1/features", json=payload)
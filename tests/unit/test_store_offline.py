@@ -330,6 +330,23 @@ async def test_get_training_data(offline_store):
     assert pd.isna(result.iloc[0]["user_clicks"])
 
 
+def test_entity_relation_registers_arrow():
+    import pyarrow as pa
+    from fabra.store.offline import _entity_relation
+
+    entity_df = pd.DataFrame({"user_id": ["u1", "u2"], "label": [1, 0]})
+    rel = _entity_relation(entity_df)
+    assert isinstance(rel, pa.Table)
+    assert rel.column_names == ["user_id", "label"]
+
+    # Arrow input is registered as-is
+    assert _entity_relation(rel) is rel
+
+    # Frames Arrow cannot represent fall back to the pandas scan
+    mixed = pd.DataFrame({"user_id": ["u1", 2]})
+    assert _entity_relation(mixed) is mixed
+
+
 def test_format_diff_report():
     from fabra.models import ContextDiff
     from fabra.utils.compare import format_diff_report
@@ -38,3 +38,12 @@ def test_anthropic_token_counter_mocked() -> None:
         # New content hits API
         assert cnt.count("New") == 5
         assert mock_client.beta.messages.count_tokens.call_count == 2
+
+
+def test_anthropic_counters_share_client() -> None:
+    with patch("anthropic.Anthropic") as MockAnthropic:
+        first = AnthropicTokenCounter(model="claude-3-5-sonnet-20240620")
+        second = AnthropicTokenCounter(model="claude-3-haiku-20240307")
+
+        assert first.client is second.client
+        MockAnthropic.assert_called_once()
@@ -9,22 +9,31 @@ These tests cover:
 - Phase 3: Context Record endpoints
 """
 
+import asyncio
 import os
+import types
 import warnings
 from pathlib import Path
-from unittest.mock import patch
+from typing import Any, Dict
+from unittest.mock import AsyncMock, patch
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
+from fabra.cli import _find_store
 from fabra.core import FeatureStore
 from fabra.store import InMemoryOnlineStore, DuckDBOfflineStore
 from fabra.ui_server import (
     _is_demo_mode,
     _get_demo_warning,
     _get_api_key,
+    _build_mermaid_graph,
+    _exec_module,
+    _state,
     app,
     load_module,
+    Entity,
     StoreInfo,
 )
 
@@ -179,6 +188,66 @@ store = FeatureStore(
             assert "FABRA_ENV=production" in warning_text
 
 
+class TestModuleCache:
+    """Tests for reusing loaded feature files."""
+
+    def test_unchanged_file_is_not_reexecuted(self, tmp_path: Path) -> None:
+        """Loading the same unchanged file reuses the module and store."""
+        feature_file = tmp_path / "cached_features.py"
+        feature_file.write_text(
+            """
+from fabra.core import FeatureStore
+from fabra.store import InMemoryOnlineStore, DuckDBOfflineStore
+
+store = FeatureStore(
+    online_store=InMemoryOnlineStore(),
+    offline_store=DuckDBOfflineStore(),
+)
+"""
+        )
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            load_module(str(feature_file))
+            first_store = _state["store"]
+            load_module(str(feature_file))
+            assert _state["store"] is first_store
+
+            # A modified file is executed again
+            stat = feature_file.stat()
+            os.utime(feature_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            load_module(str(feature_file))
+            assert _state["store"] is not first_store
+
+
+class TestStoreDiscovery:
+    """Finding the FeatureStore in a features module."""
+
+    SOURCE = """
+from fabra.core import FeatureStore
+from fabra.store import InMemoryOnlineStore, DuckDBOfflineStore
+
+aaa_scratch = FeatureStore(online_store=InMemoryOnlineStore(), offline_store=DuckDBOfflineStore())
+STORE = FeatureStore(online_store=InMemoryOnlineStore(), offline_store=DuckDBOfflineStore())
+"""
+
+    def test_store_marker_wins(self, tmp_path: Path) -> None:
+        """A top-level STORE is used over other FeatureStore instances."""
+        feature_file = tmp_path / "marked.py"
+        feature_file.write_text(self.SOURCE)
+        module, store, _, _ = _exec_module(str(feature_file))
+        assert store is module.STORE
+
+    def test_cli_store_marker_wins(self, tmp_path: Path) -> None:
+        """The CLI loaders honour the same STORE marker."""
+        module = types.ModuleType("marked")
+        exec(self.SOURCE, module.__dict__)  # nosec B102
+        assert _find_store(module) is module.STORE
+
+        del module.STORE
+        assert _find_store(module) is module.aaa_scratch
+
+
 # =============================================================================
 # Phase 2: Retriever Type Detection Tests
 # =============================================================================
@@ -493,12 +562,90 @@ def user_name(user_id: str) -> str:
         assert "offline_store_type" in data
         assert "DuckDB" in data["offline_store_type"]
 
+    def test_store_endpoint_revalidates_with_etag(self, client: TestClient) -> None:
+        """GET /api/store sends an ETag and answers a matching poll with 304."""
+        response = client.get("/api/store")
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == "no-cache"
+
+        cached = client.get("/api/store", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
     def test_features_endpoint_works(self, client: TestClient) -> None:
         """GET /api/features/{entity}/{id} returns features."""
         response = client.get("/api/features/User/test123")
         # May return empty or computed values depending on store state
         assert response.status_code in [200, 500]  # 500 if feature not seeded
 
+    def test_features_endpoint_serializes_rich_values(self, client: TestClient) -> None:
+        """Numpy arrays, models and arbitrary objects serialize to JSON."""
+
+        class Opaque:
+            def __str__(self) -> str:
+                return "opaque"
+
+        values = {
+            "embedding": np.array([0.5, 1.5]),
+            "model": Entity(name="User", id_column="user_id"),
+            "other": Opaque(),
+        }
+        with patch.object(
+            _state["store"], "get_online_features", AsyncMock(return_value=values)
+        ):
+            response = client.get("/api/features/User/u1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["embedding"] == [0.5, 1.5]
+        assert data["model"]["name"] == "User"
+        assert data["other"] == "opaque"
+
+    def test_features_batch_endpoint(self, client: TestClient) -> None:
+        """POST /api/features/batch returns one result per lookup, in order."""
+        response = client.post(
+            "/api/features/batch",
+            json=[{"entity": "User", "id": "u1"}, {"entity": "User", "id": "u2"}],
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [(r["entity"], r["id"]) for r in data] == [
+            ("User", "u1"),
+            ("User", "u2"),
+        ]
+
+        missing = client.post(
+            "/api/features/batch", json=[{"entity": "Nope", "id": "x"}]
+        )
+        assert missing.status_code == 404
+
+    def test_features_batch_bounds_concurrency(self, client: TestClient) -> None:
+        """POST /api/features/batch keeps at most FABRA_BATCH_CONCURRENCY in flight."""
+        in_flight = peak = 0
+
+        async def lookup(
+            store: Any, entity_name: str, entity_id: str
+        ) -> Dict[str, Any]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return {}
+
+        with (
+            patch("fabra.ui_server._BATCH_CONCURRENCY", 2),
+            patch("fabra.ui_server._lookup_features", lookup),
+        ):
+            response = client.post(
+                "/api/features/batch",
+                json=[{"entity": "User", "id": f"u{i}"} for i in range(6)],
+            )
+
+        assert response.status_code == 200
+        assert len(response.json()) == 6
+        assert peak == 2
+
     def test_graph_endpoint_works(self, client: TestClient) -> None:
         """GET /api/graph returns Mermaid code."""
         response = client.get("/api/graph")
@@ -507,6 +654,35 @@ def user_name(user_id: str) -> str:
         assert "code" in data
         assert "graph" in data["code"]
 
+    def test_graph_is_cached_per_registry(self, client: TestClient) -> None:
+        """Repeated GET /api/graph reuses the rendered code."""
+        _build_mermaid_graph.cache_clear()
+        first = client.get("/api/graph").json()["code"]
+        second = client.get("/api/graph").json()["code"]
+
+        assert first == second
+        assert "FEAT_user_name(user_name)" in first
+        info = _build_mermaid_graph.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_bootstrap_combines_store_and_graph(self, client: TestClient) -> None:
+        """GET /api/bootstrap returns the /api/store and /api/graph payloads."""
+        data = client.get("/api/bootstrap").json()
+
+        assert data["store"] == client.get("/api/store").json()
+        assert data["graph"] == client.get("/api/graph").json()
+
+    def test_graph_flags_large_output(self, client: TestClient) -> None:
+        """Oversized graphs carry a size header; small ones don't."""
+        response = client.get("/api/graph")
+        assert "X-Fabra-Graph-Large" not in response.headers
+
+        with patch("fabra.ui_server._MERMAID_LARGE_GRAPH_CHARS", 10):
+            response = client.get("/api/graph")
+        assert response.headers["X-Fabra-Graph-Large"] == str(
+            len(response.json()["code"])
+        )
+
     def test_auth_blocks_without_key(self, client: TestClient) -> None:
         """Endpoints require auth when FABRA_UI_API_KEY is set."""
         test_key = "test-api-key-12345"  # pragma: allowlist secret
@@ -590,6 +766,27 @@ class TestContextAssembly:
             assert len(data["items"]) == 1
             assert mock_save.called
 
+    def test_assemble_sync_context_off_event_loop(self, client: TestClient) -> None:
+        """Sync context functions run in a worker thread, not on the loop."""
+        on_loop: list = []
+
+        def record_thread(**_: str) -> object:
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return ctx_func.return_value
+
+        ctx_func = _state["contexts"]["test_ctx"]
+        ctx_func.side_effect = record_thread
+
+        with patch("fabra.ui_server._store_context_record"):
+            response = client.post("/api/context/test_ctx", json={"p1": "v1"})
+
+        assert response.status_code == 200
+        assert on_loop == [False]
+
     def test_assemble_context_not_found(self, client: TestClient) -> None:
         """POST /api/context/{name} 404s if unknown."""
         response = client.post("/api/context/unknown_ctx", json={})
@@ -95,7 +95,7 @@ def test_openai_token_counter_fallback():
 def test_openai_token_counter_success():
     mock_tiktoken = MagicMock()
     mock_enc = MagicMock()
-    mock_enc.encode.return_value = [1, 2, 3]
+    mock_enc.encode_ordinary.return_value = [1, 2, 3]
     mock_tiktoken.encoding_for_model.return_value = mock_enc
 
     with patch.dict(sys.modules, {"tiktoken": mock_tiktoken}):
@@ -103,6 +103,28 @@ def test_openai_token_counter_success():
         assert counter.count("foo") == 3
         mock_tiktoken.encoding_for_model.assert_called_with("gpt-4o")
 
+        # Repeated text is served from the LRU cache
+        assert counter.count("foo") == 3
+        mock_enc.encode_ordinary.assert_called_once_with("foo")
+
+
+def test_openai_token_counter_count_batch():
+    mock_tiktoken = MagicMock()
+    mock_enc = MagicMock()
+    mock_enc.encode_ordinary.return_value = [1]
+    mock_enc.encode_ordinary_batch.return_value = [[1, 2], [1, 2, 3]]
+    mock_tiktoken.encoding_for_model.return_value = mock_enc
+
+    with patch.dict(sys.modules, {"tiktoken": mock_tiktoken}):
+        counter = OpenAITokenCounter()
+        counter.count("a")
+
+        # Only uncached texts are sent to tiktoken, in one batch
+        assert counter.count_batch(["bb", "a", "ccc"]) == [2, 1, 3]
+        mock_enc.encode_ordinary_batch.assert_called_once_with(["bb", "ccc"])
+        assert counter.count("ccc") == 3
+        assert mock_enc.encode_ordinary.call_count == 1
+
 
 def test_anthropic_token_counter_fallback():
     # Force ImportError
@@ -1,6 +1,9 @@
 import pytest
-from unittest.mock import AsyncMock
-from fabra.worker import AxiomWorker
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+from fabra.core import Feature
+from fabra.events import AxiomEvent
+from fabra.worker import AxiomWorker, _call_convention
 
 
 @pytest.mark.asyncio
@@ -21,3 +24,120 @@ async def test_worker_setup() -> None:
     call_args = mock_redis.xgroup_create.call_args
     assert call_args[0][0] == "fabra:events:all"
     assert call_args[0][1] == "axiom_workers"
+
+
+@pytest.fixture
+def worker() -> AxiomWorker:
+    """Worker over a mock store and Redis; tests register the triggered features."""
+    store = MagicMock()
+    store.online_store.set_online_features = AsyncMock()
+    worker = AxiomWorker(redis_url="redis://localhost:6379", store=store)
+    worker.redis = AsyncMock()
+    return worker
+
+
+def _amount(entity_id: str, payload: dict) -> int:
+    return int(payload["amount"])
+
+
+@pytest.mark.asyncio
+async def test_worker_batches_writes_per_entity(worker: AxiomWorker) -> None:
+    def with_payload(entity_id: str, payload: dict) -> int:
+        return len(payload)
+
+    def plain(entity_id: str) -> str:
+        return entity_id.upper()
+
+    store: Any = worker.store
+    store.registry.get_features_by_trigger.return_value = [
+        Feature(name="n_keys", entity_name="user", func=with_payload),
+        Feature(name="upper_id", entity_name="user", func=plain),
+    ]
+
+    event = AxiomEvent(event_type="login", entity_id="u1", payload={"a": 1})
+    _call_convention.cache_clear()
+    for msg_id in ("1-0", "2-0"):
+        await worker.process_message("s", msg_id, {"data": event.model_dump_json()})
+
+    # Both features land in one write per message
+    store.online_store.set_online_features.assert_awaited_with(
+        entity_name="user", entity_id="u1", features={"n_keys": 1, "upper_id": "U1"}
+    )
+    assert store.online_store.set_online_features.await_count == 2
+    # Signatures are inspected once per function, not once per message
+    assert _call_convention.cache_info().misses == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_acks_batch_once(worker: AxiomWorker) -> None:
+    store: Any = worker.store
+    store.registry.get_features_by_trigger.return_value = [
+        Feature(name="last_amount", entity_name="user", func=_amount),
+    ]
+
+    messages = [
+        (
+            f"{i}-0",
+            {
+                "data": AxiomEvent(
+                    event_type="purchase", entity_id="u1", payload={"amount": i}
+                ).model_dump_json()
+            },
+        )
+        for i in (1, 2)
+    ]
+    messages.append(("3-0", {}))
+    await worker.process_batch("s", messages)
+
+    # The later event wins and the entity is written once
+    store.online_store.set_online_features.assert_awaited_once_with(
+        entity_name="user", entity_id="u1", features={"last_amount": 2}
+    )
+    worker.redis.xack.assert_awaited_once_with(
+        "s", worker.group_name, "1-0", "2-0", "3-0"
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_reads_raw_bytes_messages(worker: AxiomWorker) -> None:
+    store: Any = worker.store
+    store.registry.get_features_by_trigger.return_value = [
+        Feature(name="last_amount", entity_name="user", func=_amount),
+    ]
+
+    event = AxiomEvent(event_type="purchase", entity_id="u1", payload={"amount": 7})
+    await worker.process_batch(
+        "s", [(b"1-0", {b"data": event.model_dump_json().encode()})]
+    )
+
+    store.online_store.set_online_features.assert_awaited_once_with(
+        entity_name="user", entity_id="u1", features={"last_amount": 7}
+    )
+    worker.redis.xack.assert_awaited_once_with("s", worker.group_name, b"1-0")
+
+
+@pytest.mark.asyncio
+async def test_worker_reclaims_idle_pending_messages(worker: AxiomWorker) -> None:
+    worker.streams = ["s"]
+    event = AxiomEvent(event_type="purchase", entity_id="u1", payload={})
+    worker.redis.xautoclaim.return_value = [
+        b"5-0",
+        [(b"1-0", {b"data": event.model_dump_json().encode()}), (None, None)],
+        [],
+    ]
+
+    await worker.reclaim_pending()
+
+    worker.redis.xautoclaim.assert_awaited_once_with(
+        "s",
+        worker.group_name,
+        worker.consumer_name,
+        min_idle_time=worker.reclaim_min_idle_ms,
+        start_id="0-0",
+        count=100,
+    )
+    worker.redis.xack.assert_awaited_once_with("s", worker.group_name, b"1-0")
+
+    # The next pass resumes from the returned cursor
+    await worker.reclaim_pending()
+    assert worker.redis.xautoclaim.await_args.kwargs["start_id"] == b"5-0"